@@ -2,7 +2,12 @@ import bpy
 import tempfile
 import os
 import json
+import time
+import hashlib
+import zlib
+import itertools
 from bpy.app.handlers import persistent
+import numpy as np
 
 # Current version information
 major_version = 1
@@ -22,40 +27,696 @@ bl_info = {
     "support": "COMMUNITY",
 }
 
+# NumPy helpers: geometry moves through flat float32 buffers with foreach_get/foreach_set
+# instead of a Python object per vertex
+STREAM_CHUNK_SIZE = 1 << 20
+
+def new_buffer(length, dtype=np.float32, memory_limit=None):
+    # Buffers larger than memory_limit are backed by a temporary file, so the
+    # OS pages them in and out while Blender walks them instead of keeping the
+    # whole array resident.
+    dtype = np.dtype(dtype)
+    if memory_limit is None or length * dtype.itemsize <= memory_limit:
+        return np.empty(length, dtype=dtype)
+    return np.memmap(tempfile.TemporaryFile(), dtype=dtype, mode="w+", shape=(length,))
+
+def fill_buffer(buffer, value, chunk_size=STREAM_CHUNK_SIZE):
+    for start in range(0, len(buffer), chunk_size):
+        buffer[start:start + chunk_size] = value
+    if isinstance(buffer, np.memmap):
+        buffer.flush()
+    return buffer
+
+def read_vertex_positions(mesh, memory_limit=None):
+    co = new_buffer(len(mesh.vertices) * 3, memory_limit=memory_limit)
+    mesh.vertices.foreach_get("co", co)
+    return co
+
+def new_point_mesh(name, co):
+    point_cloud_mesh = bpy.data.meshes.new(name=name)
+    point_cloud_mesh.vertices.add(len(co) // 3)
+    point_cloud_mesh.vertices.foreach_set("co", co)
+    point_cloud_mesh.update()
+    return point_cloud_mesh
+
+def new_point_cloud(name, co, radius, memory_limit=None):
+    # Returns None when this Blender build cannot size a PointCloud from Python.
+    if not hasattr(bpy.data, "pointclouds"):
+        return None
+    point_cloud = bpy.data.pointclouds.new(name=name)
+    if not hasattr(point_cloud, "resize"):
+        bpy.data.pointclouds.remove(point_cloud)
+        return None
+
+    count = len(co) // 3
+    point_cloud.resize(count)
+    point_cloud.attributes["position"].data.foreach_set("vector", co)
+
+    if np.ndim(radius) == 0:
+        radius = fill_buffer(new_buffer(count, memory_limit=memory_limit), radius)
+    write_point_attribute(point_cloud, "radius", radius)
+    point_cloud.update_tag()
+    return point_cloud
+
+def point_data_type(values):
+    # The attribute type a column is written as when its source type is not known
+    width = 1 if values.ndim == 1 else values.shape[1]
+    if values.dtype.kind == "b":
+        return 'BOOLEAN' if width == 1 else None
+    if values.dtype.kind in "iu":
+        return {1: 'INT8' if values.dtype == np.int8 else 'INT', 2: 'INT32_2D'}.get(width)
+    return {1: 'FLOAT', 2: 'FLOAT2', 3: 'FLOAT_VECTOR', 4: 'FLOAT_COLOR'}.get(width)
+
+def write_point_attribute(data, name, values, data_type=None):
+    # Columns whose type cannot be told from the values or whose width does not
+    # match the type are skipped
+    if data_type is None:
+        data_type = point_data_type(values)
+    if data_type in ATTRIBUTE_WIDTHS:
+        (width, key), dtype = ATTRIBUTE_WIDTHS[data_type], np.float32
+    elif data_type in OTHER_ATTRIBUTE_TYPES:
+        width, key, dtype = OTHER_ATTRIBUTE_TYPES[data_type]
+    else:
+        return None
+    if (1 if values.ndim == 1 else values.shape[1]) != width:
+        return None
+    attribute = data.attributes.get(name)
+    if attribute is not None and attribute.data_type != data_type:
+        data.attributes.remove(attribute)
+        attribute = None
+    if attribute is None:
+        attribute = data.attributes.new(name, data_type, 'POINT')
+    attribute.data.foreach_set(key, np.ascontiguousarray(values, dtype=dtype).ravel())
+    return attribute
+
+def triangle_areas(corners):
+    # corners is an (n, 3, 3) array holding the three vertex positions of n triangles.
+    cross = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+    return 0.5 * np.sqrt(np.einsum("ij,ij->i", cross, cross))
+
+def read_loop_triangles(mesh):
+    mesh.calc_loop_triangles()
+    triangles = np.empty(len(mesh.loop_triangles) * 3, dtype=np.int32)
+    mesh.loop_triangles.foreach_get("vertices", triangles)
+    return triangles.reshape(-1, 3)
+
+def sample_triangles(corners, count, seed=0):
+    # Uniform random points over the triangles: a triangle picked by area, then
+    # barycentric weights folded back into it. Returns (triangle index, weights).
+    cumulative = np.cumsum(triangle_areas(corners), dtype=np.float64)
+    rng = np.random.default_rng(seed)
+    triangles = np.searchsorted(cumulative, rng.random(count) * cumulative[-1], side="right")
+    np.minimum(triangles, len(corners) - 1, out=triangles)
+    u, v = rng.random(count), rng.random(count)
+    outside = u + v > 1.0
+    u[outside], v[outside] = 1.0 - u[outside], 1.0 - v[outside]
+    return triangles, np.column_stack((1.0 - u - v, u, v)).astype(np.float32)
+
+SAMPLE_VERTEX_NAMES = ("sample_vertex_a", "sample_vertex_b", "sample_vertex_c")
+
+def sample_mesh_surface(mesh, count, seed=0):
+    # Samples the surface once and keeps what is needed to rebuild every point on a
+    # deformed copy of the mesh: the three vertices of its triangle and their weights.
+    triangles = read_loop_triangles(mesh)
+    if len(triangles) == 0 or count <= 0:
+        return {"position": np.zeros((0, 3), dtype=np.float32)}
+    co = read_vertex_positions(mesh).reshape(-1, 3)
+    picked, weights = sample_triangles(co[triangles], count, seed)
+    face_index = np.empty(len(triangles), dtype=np.int32)
+    mesh.loop_triangles.foreach_get("polygon_index", face_index)
+    vertices = triangles[picked]
+    columns = {
+        "position": np.einsum("ij,ijk->ik", weights, co[vertices]),
+        "barycentric": weights,
+        "face_index": face_index[picked],
+    }
+    for corner, name in enumerate(SAMPLE_VERTEX_NAMES):
+        columns[name] = vertices[:, corner]
+    return columns
+
+def progressive_surface_samples(mesh, count, seed=0):
+    # Surface samples in progressive order: the first n of them are an evenly
+    # spread set at any n, so a lower density is just a shorter prefix.
+    columns = sample_mesh_surface(mesh, count, seed)
+    order = progressive_order(columns["position"], seed=seed)
+    return {name: values[order] for name, values in columns.items()}
+
+POISSON_CANDIDATES_PER_AREA = 20.0
+
+POISSON_MAX_TRIALS = 30
+
+POISSON_MAX_CANDIDATES = 20_000_000  # about 2 GB of working memory in the sampler
+
+def poisson_disk_select(points, min_distance, seed=0, max_trials=POISSON_MAX_TRIALS):
+    # Greedy dart throwing over pre-generated candidates. On a grid of cells with
+    # diagonal min_distance each cell holds at most one point, and a point can only
+    # conflict with points up to two cells away. Cells three apart never conflict, so
+    # the 27 cell classes (x, y, z mod 3) each accept one candidate per cell at once.
+    count = len(points)
+    if count == 0:
+        return np.zeros(0, dtype=np.int64)
+    cell_size = min_distance / np.sqrt(3.0)
+    cells = np.floor((points - points.min(axis=0)) / cell_size).astype(np.int64) + 2
+    dims = cells.max(axis=0) + 3
+    if float(dims[0]) * float(dims[1]) * float(dims[2]) >= 2 ** 62:
+        raise ValueError("Minimum distance is too small for the size of the mesh")
+    keys = np.ravel_multi_index(cells.T, dims)
+
+    # Candidates grouped by cell, in random order within each cell
+    order = np.lexsort((np.random.default_rng(seed).random(count), keys))
+    sorted_keys = keys[order]
+    starts = np.flatnonzero(np.concatenate(([True], sorted_keys[1:] != sorted_keys[:-1])))
+    counts = np.diff(np.append(starts, count))
+    cell_keys = sorted_keys[starts]
+    phases = (cells[order[starts]] % 3) @ np.array([9, 3, 1])
+
+    # Occupied neighbour cells (up to two cells away) of every occupied cell, grouped by cell
+    strides = np.array([dims[1] * dims[2], dims[2], 1])
+    pair_cells, pair_neighbours = [], []
+    for delta in np.array(list(itertools.product(range(-2, 3), repeat=3))) @ strides:
+        target = cell_keys + delta
+        slots = np.minimum(np.searchsorted(cell_keys, target), len(cell_keys) - 1)
+        hits = np.flatnonzero(cell_keys[slots] == target)
+        pair_cells.append(hits)
+        pair_neighbours.append(slots[hits])
+    pair_cells = np.concatenate(pair_cells)
+    neighbours = np.concatenate(pair_neighbours)[np.argsort(pair_cells, kind="stable")]
+    neighbour_counts = np.bincount(pair_cells, minlength=len(cell_keys))
+    neighbour_starts = np.cumsum(neighbour_counts) - neighbour_counts
+
+    accepted = np.full(len(cell_keys), -1, dtype=np.int64)
+    open_cells = [np.flatnonzero(phases == phase) for phase in range(27)]
+    squared_distance = min_distance * min_distance
+    for trial in range(min(int(counts.max()), max_trials)):
+        for phase in range(27):
+            trying = open_cells[phase]
+            trying = open_cells[phase] = trying[(accepted[trying] < 0) & (counts[trying] > trial)]
+            if len(trying) == 0:
+                continue
+            candidates = order[starts[trying] + trial]
+            owners = np.repeat(np.arange(len(trying)), neighbour_counts[trying])
+            others = accepted[neighbours[expand_ranges(neighbour_starts[trying], neighbour_counts[trying])]]
+            taken = others >= 0
+            owners, others = owners[taken], others[taken]
+            offset = points[others] - points[candidates[owners]]
+            free = np.ones(len(trying), dtype=bool)
+            free[owners[np.einsum("ij,ij->i", offset, offset) < squared_distance]] = False
+            accepted[trying[free]] = candidates[free]
+    return np.sort(accepted[accepted >= 0])
+
+def poisson_disk_sample_surface(mesh, min_distance, seed=0, max_count=0):
+    # Poisson-disk points on the surface: candidates are uniform surface samples,
+    # thinned so no two points are closer than min_distance. Above max_count the
+    # result is cut to an evenly spread prefix of its progressive order.
+    triangles = read_loop_triangles(mesh)
+    if len(triangles) == 0 or min_distance <= 0.0:
+        return np.zeros((0, 3), dtype=np.float32)
+    co = read_vertex_positions(mesh).reshape(-1, 3)
+    corners = co[triangles]
+    area = float(triangle_areas(corners).sum(dtype=np.float64))
+    candidate_count = int(POISSON_CANDIDATES_PER_AREA * area / (min_distance * min_distance))
+    if max_count > 0:
+        candidate_count = min(candidate_count, max_count * int(POISSON_CANDIDATES_PER_AREA))
+    if candidate_count > POISSON_MAX_CANDIDATES:
+        raise ValueError("Minimum distance is too small for the surface, raise it or lower the maximum count")
+    picked, weights = sample_triangles(corners, candidate_count, seed)
+    candidates = np.einsum("ij,ijk->ik", weights, corners[picked])
+    points = candidates[poisson_disk_select(candidates, min_distance, seed)]
+    if max_count > 0 and len(points) > max_count:
+        points = points[progressive_order(points, seed=seed)[:max_count]]
+    return points
+
+def mesh_surface_area(mesh):
+    triangles = read_loop_triangles(mesh)
+    if len(triangles) == 0:
+        return 0.0
+    co = read_vertex_positions(mesh).reshape(-1, 3)
+    return float(triangle_areas(co[triangles]).sum(dtype=np.float64))
+
+ATTRIBUTE_WIDTHS = {'FLOAT': (1, "value"), 'FLOAT2': (2, "vector"), 'FLOAT_VECTOR': (3, "vector"), 'FLOAT_COLOR': (4, "color")}
+
+# (width, key, NumPy type) of the other attribute types that are read as point columns.
+# Byte colors are read as float colors; strings and matrices are not read.
+OTHER_ATTRIBUTE_TYPES = {
+    'INT': (1, "value", np.int32), 'INT8': (1, "value", np.int8), 'BOOLEAN': (1, "value", bool),
+    'INT32_2D': (2, "value", np.int32), 'BYTE_COLOR': (4, "color", np.float32), 'QUATERNION': (4, "value", np.float32),
+}
+
+def read_point_attributes(data, data_types=None):
+    # data_types, when given, receives the Blender type of every column read
+    count = len(data.points) if hasattr(data, "points") else len(data.vertices)
+    columns = {}
+    for attribute in data.attributes:
+        if attribute.domain != 'POINT' or attribute.name.startswith("."):
+            continue
+        if attribute.data_type in ATTRIBUTE_WIDTHS:
+            width, key = ATTRIBUTE_WIDTHS[attribute.data_type]
+            dtype = np.float32
+        elif attribute.data_type in OTHER_ATTRIBUTE_TYPES:
+            width, key, dtype = OTHER_ATTRIBUTE_TYPES[attribute.data_type]
+        else:
+            continue
+        values = np.empty(count * width, dtype=dtype)
+        attribute.data.foreach_get(key, values)
+        columns[attribute.name] = values.reshape(count, width) if width > 1 else values
+        if data_types is not None:
+            data_types[attribute.name] = attribute.data_type
+    if "position" not in columns and hasattr(data, "vertices"):
+        columns["position"] = read_vertex_positions(data).reshape(-1, 3)
+    return columns
+
+def read_evaluated_points(depsgraph, obj, data_types=None):
+    # Collects the points the object actually evaluates to, including the point
+    # clouds produced by geometry nodes, in world space. Instanced geometry is skipped.
+    point_sets = []
+    for instance in depsgraph.object_instances:
+        owner = instance.parent if instance.is_instance else instance.object
+        if owner is None or owner.original != obj:
+            continue
+        instance_object = instance.object
+        if instance_object.type == 'POINTCLOUD' or (instance_object.type == 'MESH' and not instance.is_instance):
+            columns = read_point_attributes(instance_object.data, data_types)
+            if len(columns["position"]) == 0:
+                continue
+            matrix = np.array(instance.matrix_world, dtype=np.float32)
+            columns["position"] = columns["position"] @ matrix[:3, :3].T + matrix[:3, 3]
+            point_sets.append(columns)
+
+    if not point_sets:
+        return {}
+    names = [name for name in point_sets[0] if all(name in columns for columns in point_sets)]
+    return {name: np.concatenate([columns[name] for columns in point_sets]) for name in names}
+
+OCTREE_DEPTH = 10
+
+OCTREE_LEAF_SIZE = 64
+
+def expand_ranges(starts, lengths):
+    # Concatenates arange(start, start + length) for every pair without a Python loop.
+    lengths = np.asarray(lengths, dtype=np.int64)
+    offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+    return offsets + np.arange(lengths.sum(), dtype=np.int64)
+
+def spread_bits(values):
+    # Moves the low 21 bits of each value three bits apart, ready to interleave.
+    values = values.astype(np.uint64) & np.uint64(0x1FFFFF)
+    for shift, mask in ((32, 0x1F00000000FFFF), (16, 0x1F0000FF0000FF), (8, 0x100F00F00F00F00F),
+                        (4, 0x10C30C30C30C30C3), (2, 0x1249249249249249)):
+        values = (values | (values << np.uint64(shift))) & np.uint64(mask)
+    return values
+
+def morton_codes(points, depth=OCTREE_DEPTH, low=None, extent=None):
+    # Quantizes the points to a 2**depth grid over their bounding cube and interleaves the cell coordinates.
+    if low is None:
+        low = points.min(axis=0)
+        extent = float((points.max(axis=0) - low).max()) or 1.0
+    cells = ((points - low) * ((1 << depth) / extent)).astype(np.int64)
+    np.clip(cells, 0, (1 << depth) - 1, out=cells)
+    return (spread_bits(cells[:, 0]) << np.uint64(2)) | (spread_bits(cells[:, 1]) << np.uint64(1)) | spread_bits(cells[:, 2])
+
+def build_octree(points, depth=OCTREE_DEPTH, leaf_size=OCTREE_LEAF_SIZE, seed=None):
+    # Every node is a contiguous range of the Morton-sorted points. Nodes holding more
+    # than leaf_size points are split into the runs of their next three code bits, one
+    # whole level at a time. Nodes are stored breadth first, so the children of a node
+    # are the node_child_count entries starting at node_first_child. With a seed, the
+    # points sharing a cell are sorted in random order instead of index order.
+    points = np.asarray(points, dtype=np.float32).reshape(-1, 3)
+    count = len(points)
+    if count == 0:
+        points = np.zeros((1, 3), dtype=np.float32)
+    shuffle = None if seed is None else np.random.default_rng(seed).permutation(len(points))
+    codes = morton_codes(points if shuffle is None else points[shuffle], depth)
+    order = np.argsort(codes, kind="stable")
+    codes = codes[order]
+    if shuffle is not None:
+        order = shuffle[order]
+
+    level_starts, level_ends = np.zeros(1, np.int64), np.full(1, count, np.int64)
+    starts, ends, levels, parents = [level_starts], [level_ends], [np.zeros(1, np.uint8)], [np.full(1, -1, np.int64)]
+    level_offset = 0
+    for level in range(1, depth + 1):
+        split = np.flatnonzero(level_ends - level_starts > leaf_size)
+        if len(split) == 0:
+            break
+        lengths = level_ends[split] - level_starts[split]
+        members = expand_ranges(level_starts[split], lengths)
+        prefix = codes[members] >> np.uint64(3 * (depth - level))
+        run_starts = np.flatnonzero(np.concatenate(([True], prefix[1:] != prefix[:-1])))
+        run_ends = np.append(run_starts[1:], len(members))
+        parent = split[np.searchsorted(np.cumsum(lengths), run_starts, side="right")] + level_offset
+
+        level_offset += len(level_starts)
+        level_starts, level_ends = members[run_starts], members[run_ends - 1] + 1
+        starts.append(level_starts)
+        ends.append(level_ends)
+        levels.append(np.full(len(level_starts), level, np.uint8))
+        parents.append(parent)
+
+    node_start, node_end, node_parent = np.concatenate(starts), np.concatenate(ends), np.concatenate(parents)
+    node_first_child = np.full(len(node_start), -1, np.int64)
+    child_parents, first_children = np.unique(node_parent[1:], return_index=True)
+    node_first_child[child_parents] = first_children + 1
+    node_child_count = np.bincount(node_parent[1:], minlength=len(node_start)).astype(np.uint8)
+
+    # Tight bounds of every range in one reduceat over interleaved start/end pairs
+    sorted_points = points[order]
+    padded = np.vstack((sorted_points, sorted_points[-1:]))
+    pairs = np.column_stack((node_start, np.maximum(node_end, node_start + 1))).ravel()
+    return {
+        "order": order[:count],
+        "codes": codes[:count],
+        "node_start": node_start,
+        "node_end": node_end,
+        "node_level": np.concatenate(levels),
+        "node_first_child": node_first_child,
+        "node_child_count": node_child_count,
+        "node_min": np.minimum.reduceat(padded, pairs, axis=0)[::2],
+        "node_max": np.maximum.reduceat(padded, pairs, axis=0)[::2],
+    }
+
+def progressive_order(points, depth=OCTREE_DEPTH, seed=0, octree=None):
+    # Orders the points so that every prefix is spread evenly: first one point per cell
+    # of the coarsest octree level, then one point for each newly occupied cell of every
+    # finer level, each level shuffled. Keeping the first n points is a level of detail.
+    # An octree built over the same points with a seed saves sorting them again.
+    points = np.asarray(points, dtype=np.float32).reshape(-1, 3)
+    if len(points) == 0:
+        return np.zeros(0, dtype=np.int64)
+    if octree is not None:
+        order, codes = octree["order"], octree["codes"]
+    else:
+        # Shuffle first so the point standing for a cell is a random one, not its lowest corner
+        shuffle = np.random.default_rng(seed).permutation(len(points))
+        codes = morton_codes(points[shuffle], depth)
+        by_code = np.argsort(codes, kind="stable")
+        order, codes = shuffle[by_code], codes[by_code]
+
+    levels = np.full(len(points), depth + 1, dtype=np.int64)
+    for level in range(depth + 1):
+        prefix = codes >> np.uint64(3 * (depth - level))
+        first = np.concatenate(([True], prefix[1:] != prefix[:-1]))
+        levels[first & (levels > level)] = level
+    tie_break = np.random.default_rng(seed + 1).random(len(points))
+    return order[np.lexsort((tie_break, levels))]
+
+KNN_CHUNK_SIZE = 1 << 12
+
+def knn_spacing(points, k=8, window=8, shifts=2, chunk_size=KNN_CHUNK_SIZE, octree=None):
+    # Mean distance from every point to its k nearest neighbours. Candidates are the
+    # window points on either side in Morton order, over a few shifted copies of the grid
+    # so neighbours split by a cell boundary in one ordering are adjacent in another.
+    # This is an approximate k-NN, but every step is a fixed-width array operation.
+    # The unshifted ordering is taken from the octree when one is given. The window
+    # grows with k, since fewer than k candidates per side miss most of the neighbours.
+    points = np.asarray(points, dtype=np.float32).reshape(-1, 3)
+    count = len(points)
+    if count < 2:
+        return np.zeros(count, dtype=np.float32)
+    k = min(k, count - 1)
+    window = max(window, k)
+    low = points.min(axis=0)
+    extent = float((points.max(axis=0) - low).max()) or 1.0
+    offsets = np.concatenate((np.arange(-window, 0), np.arange(1, window + 1)))
+
+    best = np.full((count, k), np.inf, dtype=np.float32)
+    best_ids = np.full((count, k), -1, dtype=np.int64)
+    for shift in range(shifts):
+        # Each shifted grid doubles the cube so every shifted point still fits
+        shifted_low = low - shift * extent / (2 * shifts - 1)
+        if shift == 0 and octree is not None:
+            order = octree["order"]
+        else:
+            order = np.argsort(morton_codes(points, OCTREE_DEPTH, shifted_low, 2.0 * extent if shift else extent), kind="stable")
+        sorted_points = points[order]
+        for start in range(0, count, chunk_size):
+            stop = min(start + chunk_size, count)
+            block = sorted_points[start:stop]
+            distances = np.full((stop - start, len(offsets)), np.inf, dtype=np.float32)
+            candidates = np.full((stop - start, len(offsets)), -1, dtype=np.int64)
+            for column, offset in enumerate(offsets):
+                low_row, high_row = max(start + offset, 0), min(stop + offset, count)
+                if low_row >= high_row:
+                    continue
+                delta = sorted_points[low_row:high_row] - block[low_row - offset - start:high_row - offset - start]
+                distances[low_row - offset - start:high_row - offset - start, column] = np.einsum("ij,ij->i", delta, delta)
+                candidates[low_row - offset - start:high_row - offset - start, column] = order[low_row:high_row]
+
+            # Merge with the neighbours found so far, skipping ones already found in an earlier ordering
+            ids = order[start:stop]
+            if shift:
+                distances[(candidates[:, :, None] == best_ids[ids][:, None, :]).any(axis=2)] = np.inf
+            distances = np.concatenate((best[ids], distances), axis=1)
+            candidates = np.concatenate((best_ids[ids], candidates), axis=1)
+            nearest = np.argpartition(distances, k - 1, axis=1)[:, :k]
+            best[ids] = np.take_along_axis(distances, nearest, axis=1)
+            best_ids[ids] = np.take_along_axis(candidates, nearest, axis=1)
+
+    found = np.isfinite(best)
+    return (np.sqrt(np.where(found, best, 0.0)).sum(axis=1) / np.maximum(found.sum(axis=1), 1)).astype(np.float32)
+
+def point_cache_path(directory, frame):
+    return os.path.join(directory, f"frame_{frame:06d}.npy")
+
+def write_point_cache_frame(filepath, columns):
+    # One structured .npy per frame: the header records the columns, and the
+    # records load back through a memory map without parsing.
+    count = len(columns["position"])
+    fields = [(name, values.dtype, values.shape[1:]) for name, values in columns.items()]
+    records = np.empty(count, dtype=np.dtype(fields))
+    for name, values in columns.items():
+        records[name] = values
+    np.save(filepath, records, allow_pickle=False)
+
+def read_point_cache_frame(filepath):
+    records = np.load(filepath, mmap_mode="r", allow_pickle=False)
+    return {name: np.asarray(records[name]) for name in records.dtype.names}
+
+def load_points_into_mesh(mesh, columns, data_types=None):
+    mesh.clear_geometry()
+    positions = columns["position"]
+    mesh.vertices.add(len(positions))
+    mesh.vertices.foreach_set("co", np.ascontiguousarray(positions, dtype=np.float32).ravel())
+    for name, values in columns.items():
+        if name != "position":
+            write_point_attribute(mesh, name, values, (data_types or {}).get(name))
+    mesh.update()
+
 # Global variable to store whether the addon is unlocked
 addon_unlocked = False
 
-def update_geometry_node(self, context):
-    selected_object = context.active_object
-    if selected_object and selected_object.type == 'MESH':
-        props = selected_object.blender_points_props
-        for mod in selected_object.modifiers:
-            if mod.type == 'NODES' and mod.node_group:
-                node_group = mod.node_group
-                for node in node_group.nodes:
-                    if node.bl_idname == "GeometryNodeSetPointRadius":
-                        node.inputs['Radius'].default_value = props.radius
-                    if node.bl_idname == "GeometryNodeDistributePointsOnFaces":
-                        node.inputs['Density'].default_value = props.density
-                        node.inputs['Seed'].default_value = props.random
-                    if node.bl_idname == "GeometryNodeMeshToPoints":
-                        node.inputs['Radius'].default_value = props.radius
-                    if node.bl_idname == "GeometryNodeInstanceOnPoints":
-                        if props.selected_feature == 'ADD_POINTS':
-                            node.mute = not props.enable_points_add
-                            node.inputs['Scale'].default_value = (props.scale_add, props.scale_add, props.scale_add)
-                        elif props.selected_feature == 'MESH_TO_POINTS':
-                            node.mute = not props.enable_points_mesh
-                            node.inputs['Scale'].default_value = (props.scale_mesh, props.scale_mesh, props.scale_mesh)
-                    if node.bl_idname == "GeometryNodeObjectInfo":
-                        instance_obj = bpy.data.objects.get(props.instance_object_mesh if props.selected_feature == 'MESH_TO_POINTS' else props.instance_object_add)
-                        if instance_obj:
-                            node.inputs['Object'].default_value = instance_obj
+# Slider inputs are coalesced and committed once the value has been idle this long
+UPDATE_IDLE_SECONDS = 0.15
+PREVIEW_DENSITY_FACTOR = 0.1
+DEBOUNCED_INPUTS = {
+    "Density", "Viewport Density", "Viewport Point Budget", "Radius", "Radius Factor", "Seed", "Scale",
+    "Camera Near", "Camera Far", "Camera Min Density",
+}
+# Only the viewport density is previewed; the render Density input has no visible
+# effect in the viewport, so writing it early would only re-evaluate the modifier.
+PREVIEW_INPUTS = {"Viewport Density"}
+
+# (object name, input name) -> time of the latest change
+pending_point_inputs = {}
+
+def update_point_input(input_name, feature=None):
+    def update(self, context):
+        selected_object = self.id_data
+        if not isinstance(selected_object, bpy.types.Object):
+            return
+        if feature is not None and self.selected_feature != feature:
+            return
+        if input_name in DEBOUNCED_INPUTS:
+            schedule_point_input(selected_object, input_name)
+        else:
+            write_point_input(selected_object, input_name)
+    return update
+
+def write_point_input(selected_object, input_name, factor=1.0):
+    # Writes one modifier input of the object, no modifier or node scans
+    props = selected_object.blender_points_props
+    modifier = selected_object.modifiers.get(props.points_modifier)
+    if modifier is None or modifier.node_group is None:
+        return
+    value = POINT_INPUT_GETTERS[input_name](selected_object, props, props.selected_feature)
+    if factor != 1.0:
+        value *= factor
+    set_modifier_inputs(modifier, {input_name: value})
+    selected_object.update_tag(refresh={'DATA'})
+
+def schedule_point_input(selected_object, input_name):
+    if input_name in PREVIEW_INPUTS:
+        write_point_input(selected_object, input_name, PREVIEW_DENSITY_FACTOR)
+    pending_point_inputs[(selected_object.name, input_name)] = time.monotonic()
+    if not bpy.app.timers.is_registered(flush_point_inputs):
+        bpy.app.timers.register(flush_point_inputs, first_interval=UPDATE_IDLE_SECONDS)
+
+def flush_point_inputs():
+    now = time.monotonic()
+    for key, changed in list(pending_point_inputs.items()):
+        if now - changed < UPDATE_IDLE_SECONDS:
+            continue
+        del pending_point_inputs[key]
+        object_name, input_name = key
+        selected_object = bpy.data.objects.get(object_name)
+        if selected_object is not None:
+            write_point_input(selected_object, input_name)
+    return UPDATE_IDLE_SECONDS if pending_point_inputs else None
+
+update_density = update_point_input("Density")
+
+def update_density_mode(self, context):
+    selected_object = self.id_data
+    if isinstance(selected_object, bpy.types.Object) and selected_object.type == 'MESH' and self.density_mode == 'POINT_COUNT':
+        refresh_surface_area(selected_object)
+    update_density(self, context)
+
+update_adaptive_radius = update_point_input("Adaptive Radius", 'MESH_TO_POINTS')
+
+def update_radius_mode(self, context):
+    selected_object = self.id_data
+    if isinstance(selected_object, bpy.types.Object) and selected_object.type == 'MESH' and self.radius_mode == 'ADAPTIVE':
+        refresh_mesh_attributes(selected_object)
+    update_adaptive_radius(self, context)
+
+def update_camera_falloff(self, context):
+    # Picks up the current scene camera whenever the falloff is switched
+    selected_object = self.id_data
+    if isinstance(selected_object, bpy.types.Object) and self.selected_feature == 'ADD_POINTS':
+        write_point_input(selected_object, "Camera")
+        write_point_input(selected_object, "Camera Falloff")
+
+FRUSTUM_INPUTS = ("Camera", "Frustum Size", "Frustum Slope", "Clip Start", "Clip End", "Cull Viewport", "Cull Render")
+
+def update_frustum_culling(self, context):
+    selected_object = self.id_data
+    if isinstance(selected_object, bpy.types.Object):
+        for input_name in FRUSTUM_INPUTS:
+            write_point_input(selected_object, input_name)
+
+def update_use_point_cache(self, context):
+    selected_object = self.id_data
+    if not isinstance(selected_object, bpy.types.Object):
+        return
+    if self.use_point_cache:
+        load_point_cache_frame(selected_object, context.scene.frame_current)
+    write_point_input(selected_object, "Cache Object")
+    write_point_input(selected_object, "Use Cache")
+
+def update_use_stable_points(self, context):
+    selected_object = self.id_data
+    if not isinstance(selected_object, bpy.types.Object) or self.selected_feature != 'ADD_POINTS':
+        return
+    if self.use_stable_points and bpy.data.objects.get(self.stable_points_object) is None:
+        sample_stable_points(selected_object)
+    write_point_input(selected_object, "Stable Object")
+    write_point_input(selected_object, "Stable Points")
+
+def update_point_helpers(self, context):
+    # Settings the Distribute Points helpers are sampled with rebuild them once the edits settle
+    selected_object = self.id_data
+    if isinstance(selected_object, bpy.types.Object) and self.selected_feature == 'ADD_POINTS':
+        schedule_mesh_attributes(selected_object)
+
+update_seed = update_point_input("Seed")
+
+def update_random(self, context):
+    update_seed(self, context)
+    update_point_helpers(self, context)
+
+def update_distribution_method(self, context):
+    selected_object = self.id_data
+    if not isinstance(selected_object, bpy.types.Object) or self.selected_feature != 'ADD_POINTS':
+        return
+    if self.distribution_method == 'POISSON' and bpy.data.objects.get(self.poisson_points_object) is None:
+        try:
+            build_poisson_points(selected_object)
+        except ValueError:
+            pass  # kept in poisson_error and shown in the panel
+    write_point_input(selected_object, "Poisson Object")
+    write_point_input(selected_object, "Poisson Points")
+
+def update_use_progressive_density(self, context):
+    selected_object = self.id_data
+    if not isinstance(selected_object, bpy.types.Object) or self.selected_feature != 'ADD_POINTS':
+        return
+    if self.use_progressive_density and bpy.data.objects.get(self.progressive_points_object) is None:
+        build_progressive_points(selected_object)
+    write_point_input(selected_object, "Progressive Object")
+    write_point_input(selected_object, "Progressive Density")
+
+def update_radius_neighbors(self, context):
+    selected_object = self.id_data
+    if isinstance(selected_object, bpy.types.Object) and selected_object.type == 'MESH' and self.radius_mode == 'ADAPTIVE':
+        refresh_mesh_attributes(selected_object)
+        selected_object.update_tag(refresh={'DATA'})
+
+# Blender only keeps the strings of dynamic enum items alive while Python holds
+# them, so the list lives here and is rebuilt only when mesh objects change.
+instance_object_items = []
+instance_object_names = {}  # object pointer -> name
+instance_object_pointers = set()  # pointers of every object the cache has seen
+instance_object_count = -1  # len(bpy.data.objects) the cache was built for
+
+def is_instance_candidate(obj):
+    return obj.type == 'MESH' and obj.name != "PointCloud" and not obj.get("blender_points_helper")
+
+def rebuild_instance_object_items():
+    instance_object_items.clear()
+    instance_object_items.append(("None", "Nothing Selected", ""))
+    instance_object_items.extend((name, name, "") for name in sorted(set(instance_object_names.values())))
+
+def reset_instance_object_items():
+    global instance_object_count
+    instance_object_names.clear()
+    instance_object_names.update((obj.as_pointer(), obj.name) for obj in bpy.data.objects if is_instance_candidate(obj))
+    instance_object_pointers.clear()
+    instance_object_pointers.update(obj.as_pointer() for obj in bpy.data.objects)
+    instance_object_count = len(bpy.data.objects)
+    rebuild_instance_object_items()
 
 def get_instance_object_items(self, context):
-    items = [("None", "Nothing Selected", "")]
-    items += [(obj.name, obj.name, "") for obj in bpy.data.objects if obj.type == 'MESH' and obj.name != "PointCloud"]
-    return items
+    if instance_object_count < 0:
+        reset_instance_object_items()
+    return instance_object_items
+
+@persistent
+def update_instance_object_items(scene, depsgraph):
+    global instance_object_count
+    if instance_object_count < 0:
+        return
+
+    changed = False
+    added = 0
+    for update in depsgraph.updates:
+        if not isinstance(update.id, bpy.types.Object):
+            continue
+        obj = update.id.original
+        key = obj.as_pointer()
+        if key not in instance_object_pointers:
+            instance_object_pointers.add(key)
+            added += 1
+        if is_instance_candidate(obj):
+            if instance_object_names.get(key) != obj.name:
+                instance_object_names[key] = obj.name
+                changed = True
+        elif instance_object_names.pop(key, None) is not None:
+            changed = True
+
+    # Deleted objects never show up in depsgraph.updates, so any object count other
+    # than the one the reported additions explain (a delete, or a delete and an add
+    # in the same update) means a full rebuild
+    if len(bpy.data.objects) != instance_object_count + added:
+        reset_instance_object_items()
+        return
+    instance_object_count += added
+    if changed:
+        rebuild_instance_object_items()
+
+@persistent
+def clear_instance_object_items(dummy):
+    # Also runs after undo and redo, which give every object a new pointer
+    global instance_object_count
+    instance_object_count = -1
 
 class BlenderPointsProperties(bpy.types.PropertyGroup):
     radius: bpy.props.FloatProperty(
@@ -64,7 +725,197 @@ class BlenderPointsProperties(bpy.types.PropertyGroup):
         default=0.023,
         min=0.0,
         max=100.0,
-        update=update_geometry_node
+        update=update_point_input("Radius")
+    )
+    radius_mode: bpy.props.EnumProperty(
+        name="Radius Mode",
+        description="How Mesh to Points sizes the points",
+        items=[
+            ('FIXED', "Fixed", "Give every point the Point Size radius"),
+            ('ADAPTIVE', "Adaptive", "Size every point from the spacing to its nearest neighbours"),
+        ],
+        default='FIXED',
+        update=update_radius_mode
+    )
+    radius_factor: bpy.props.FloatProperty(
+        name="Radius Factor",
+        description="Adaptive radius as a fraction of the local point spacing",
+        default=0.5,
+        min=0.0,
+        max=10.0,
+        update=update_point_input("Radius Factor", 'MESH_TO_POINTS')
+    )
+    radius_neighbors: bpy.props.IntProperty(
+        name="Neighbours",
+        description="Number of nearest neighbours averaged into the local point spacing",
+        default=8,
+        min=1,
+        max=64,
+        update=update_radius_neighbors
+    )
+    use_camera_falloff: bpy.props.BoolProperty(
+        name="Camera Falloff",
+        description="Lower the density with distance from the scene camera",
+        default=False,
+        update=update_camera_falloff
+    )
+    camera_near: bpy.props.FloatProperty(
+        name="Near Distance",
+        description="Distance from the camera up to which the full density is used",
+        default=10.0,
+        min=0.0,
+        unit='LENGTH',
+        update=update_point_input("Camera Near", 'ADD_POINTS')
+    )
+    camera_far: bpy.props.FloatProperty(
+        name="Far Distance",
+        description="Distance from the camera from which the minimum density is used",
+        default=100.0,
+        min=0.0,
+        unit='LENGTH',
+        update=update_point_input("Camera Far", 'ADD_POINTS')
+    )
+    camera_min_density: bpy.props.FloatProperty(
+        name="Minimum Density",
+        description="Share of the density kept at and beyond the far distance",
+        default=0.1,
+        min=0.0,
+        max=1.0,
+        subtype='FACTOR',
+        update=update_point_input("Camera Min Density", 'ADD_POINTS')
+    )
+    cull_viewport: bpy.props.BoolProperty(
+        name="Cull in Viewport",
+        description="Delete the points outside the scene camera's view before instancing, in the viewport",
+        default=False,
+        update=update_frustum_culling
+    )
+    cull_render: bpy.props.BoolProperty(
+        name="Cull in Render",
+        description="Delete the points outside the scene camera's view before instancing, in renders. "
+                    "Leave off for shots with motion blur, reflections or shadows from off-screen points",
+        default=False,
+        update=update_frustum_culling
+    )
+    cull_margin: bpy.props.FloatProperty(
+        name="Cull Margin",
+        description="Distance by which the camera view is widened before culling, so large instances near the edge stay",
+        default=1.0,
+        min=0.0,
+        unit='LENGTH',
+        update=update_frustum_culling
+    )
+    distribution_method: bpy.props.EnumProperty(
+        name="Distribution",
+        description="How Distribute Points places the points",
+        items=[
+            ('RANDOM', "Random", "Scatter points at random with the Density"),
+            ('POISSON', "Poisson Disk", "Evenly spaced points from the CPU Poisson-disk sampler"),
+        ],
+        default='RANDOM',
+        update=update_distribution_method
+    )
+    poisson_min_distance: bpy.props.FloatProperty(
+        name="Minimum Distance",
+        description="Smallest distance allowed between two Poisson-disk points",
+        default=0.05,
+        min=0.0001,
+        unit='LENGTH',
+        update=update_point_helpers
+    )
+    poisson_max_count: bpy.props.IntProperty(
+        name="Maximum Count",
+        description="Upper limit on the Poisson-disk points, 0 for no limit",
+        default=1000000,
+        min=0,
+        update=update_point_helpers
+    )
+    poisson_points_object: bpy.props.StringProperty(
+        name="Poisson Points Object",
+        description="Hidden point cloud holding the Poisson-disk points",
+        default=""
+    )
+    poisson_error: bpy.props.StringProperty(
+        name="Poisson Error",
+        description="Why the last Poisson-disk sampling failed, empty when it succeeded",
+        default=""
+    )
+    use_progressive_density: bpy.props.BoolProperty(
+        name="Progressive Density",
+        description="Sample once at the maximum density and keep a prefix of the samples, "
+                    "so density changes need no resampling",
+        default=False,
+        update=update_use_progressive_density
+    )
+    progressive_max_density: bpy.props.FloatProperty(
+        name="Maximum Density",
+        description="Density of the precomputed sample set, the highest density Progressive Density can show",
+        default=100.0,
+        min=0.0,
+        max=1000000.0,
+        update=update_point_helpers
+    )
+    progressive_points_object: bpy.props.StringProperty(
+        name="Progressive Points Object",
+        description="Hidden mesh holding the precomputed samples in progressive order",
+        default=""
+    )
+    use_stable_points: bpy.props.BoolProperty(
+        name="Stable Points",
+        description="Sample the rest pose once and carry the points along with the deforming mesh, so they do not swim",
+        default=False,
+        update=update_use_stable_points
+    )
+    stable_points_object: bpy.props.StringProperty(
+        name="Stable Points Object",
+        description="Hidden mesh holding the rest pose samples",
+        default=""
+    )
+    point_cache_directory: bpy.props.StringProperty(
+        name="Cache Directory",
+        description="Folder the baked frames are written to, one subfolder per object",
+        default="//point_cache/",
+        subtype='DIR_PATH'
+    )
+    point_cache_start: bpy.props.IntProperty(
+        name="Start Frame",
+        description="First frame to bake",
+        default=1,
+        min=0
+    )
+    point_cache_end: bpy.props.IntProperty(
+        name="End Frame",
+        description="Last frame to bake",
+        default=250,
+        min=0
+    )
+    use_point_cache: bpy.props.BoolProperty(
+        name="Use Point Cache",
+        description="Play back and render the baked points instead of generating them every frame",
+        default=False,
+        update=update_use_point_cache
+    )
+    point_cache_object: bpy.props.StringProperty(
+        name="Point Cache Object",
+        description="Hidden mesh holding the cached points of the current frame",
+        default=""
+    )
+    point_cache_key: bpy.props.StringProperty(
+        name="Point Cache Key",
+        description="Hash of the source mesh and settings the cache was baked with",
+        default=""
+    )
+    lod_level: bpy.props.EnumProperty(
+        name="Level of Detail",
+        description="Share of the mesh points that Mesh to Points keeps",
+        items=[
+            ('0', "Full", "Keep every point"),
+            ('1', "1/4", "Keep a quarter of the points"),
+            ('2', "1/16", "Keep one point in sixteen"),
+            ('3', "1/64", "Keep one point in sixty-four"),
+        ],
+        default='0',
+        update=update_point_input("LOD Fraction", 'MESH_TO_POINTS')
     )
     density: bpy.props.FloatProperty(
         name="Density",
@@ -72,7 +923,46 @@ class BlenderPointsProperties(bpy.types.PropertyGroup):
         default=25.0,
         min=0.0,
         max=1000000.0,
-        update=update_geometry_node
+        update=update_point_input("Density")
+    )
+    density_mode: bpy.props.EnumProperty(
+        name="Density Mode",
+        description="How the number of distributed points is chosen",
+        items=[
+            ('DENSITY', "Density", "Points per square unit of surface"),
+            ('POINT_COUNT', "Point Count", "Solve the density that gives a target number of points"),
+        ],
+        default='DENSITY',
+        update=update_density_mode
+    )
+    target_point_count: bpy.props.IntProperty(
+        name="Target Point Count",
+        description="Number of points to distribute over the whole surface",
+        default=100000,
+        min=0,
+        update=update_point_input("Density")
+    )
+    surface_area: bpy.props.FloatProperty(
+        name="Surface Area",
+        description="Surface area of the mesh, kept up to date while Point Count mode is used",
+        default=0.0,
+        min=0.0,
+        update=update_point_input("Density")
+    )
+    viewport_density: bpy.props.FloatProperty(
+        name="Viewport Density",
+        description="Density of the Points in the viewport, render uses Density",
+        default=25.0,
+        min=0.0,
+        max=1000000.0,
+        update=update_point_input("Viewport Density")
+    )
+    viewport_point_budget: bpy.props.IntProperty(
+        name="Viewport Point Budget",
+        description="Lower the viewport density so no more than this many points are shown, 0 for no limit",
+        default=1000000,
+        min=0,
+        update=update_point_input("Viewport Point Budget")
     )
     random: bpy.props.IntProperty(
         name="Random Seed",
@@ -80,31 +970,31 @@ class BlenderPointsProperties(bpy.types.PropertyGroup):
         default=0,
         min=0,
         max=100,
-        update=update_geometry_node
+        update=update_random
     )
     enable_points_add: bpy.props.BoolProperty(
         name="Enable Points Instancing for Distribute Points",
         description="Enable or disable points instancing for Distribute Points",
         default=False,
-        update=update_geometry_node
+        update=update_point_input("Instancing", 'ADD_POINTS')
     )
     enable_points_mesh: bpy.props.BoolProperty(
         name="Enable Points Instancing for Mesh to Points",
         description="Enable or disable points instancing for Mesh to Points",
         default=False,
-        update=update_geometry_node
+        update=update_point_input("Instancing", 'MESH_TO_POINTS')
     )
     instance_object_add: bpy.props.EnumProperty(
         name="Instance Object for Distribute Points",
         description="Select your object to replace the points for Distribute Points",
         items=get_instance_object_items,
-        update=update_geometry_node
+        update=update_point_input("Instance Object", 'ADD_POINTS')
     )
     instance_object_mesh: bpy.props.EnumProperty(
         name="Instance Object for Mesh to Points",
         description="Select your object to replace the points for Mesh to Points",
         items=get_instance_object_items,
-        update=update_geometry_node
+        update=update_point_input("Instance Object", 'MESH_TO_POINTS')
     )
     scale_add: bpy.props.FloatProperty(
         name="Scale for Distribute Points",
@@ -112,7 +1002,7 @@ class BlenderPointsProperties(bpy.types.PropertyGroup):
         default=1.0,
         min=0.0,
         max=10.0,
-        update=update_geometry_node
+        update=update_point_input("Scale", 'ADD_POINTS')
     )
     scale_mesh: bpy.props.FloatProperty(
         name="Scale for Mesh to Points",
@@ -120,7 +1010,7 @@ class BlenderPointsProperties(bpy.types.PropertyGroup):
         default=1.0,
         min=0.0,
         max=10.0,
-        update=update_geometry_node
+        update=update_point_input("Scale", 'MESH_TO_POINTS')
     )
     applied_effect: bpy.props.StringProperty(
         name="Applied Effect",
@@ -151,6 +1041,17 @@ class BlenderPointsProperties(bpy.types.PropertyGroup):
         description="Stores the selected feature",
         default=""
     )
+    memory_warning_mb: bpy.props.IntProperty(
+        name="Memory Warning (MB)",
+        description="Warn in the panel when the estimated point memory goes over this size",
+        default=2048,
+        min=1
+    )
+    points_modifier: bpy.props.StringProperty(
+        name="Points Modifier",
+        description="Name of the modifier that carries the Blender.Points node group",
+        default=""
+    )
 
 def save_user_credentials(email, token):
     credentials_path = os.path.join(bpy.utils.user_resource('CONFIG'), "blender_points_credentials.json")
@@ -178,132 +1079,1333 @@ def enable_cycles(context):
     context.scene.render.engine = 'CYCLES'
     context.scene.cycles.device = 'GPU'
 
-def apply_distribute_points(context):
-    selected_object = context.active_object
-    props = selected_object.blender_points_props  # Use object property
+NODE_GROUP_VERSION = 12
+DISTRIBUTE_POINTS_GROUP = "Blender.Points Distribute Points"
+MESH_TO_POINTS_GROUP = "Blender.Points Mesh to Points"
+
+def new_geometry_node_group(name):
+    node_group = bpy.data.node_groups.new(name, 'GeometryNodeTree')
+    new_group_socket(node_group, "Geometry", 'NodeSocketGeometry')
+    new_group_socket(node_group, "Geometry", 'NodeSocketGeometry', in_out='OUTPUT')
+
+    group_input = node_group.nodes.new('NodeGroupInput')
+    group_output = node_group.nodes.new('NodeGroupOutput')
+    group_input.location = (-300, 0)
+    group_output.location = (1300, 0)
+    return node_group
+
+def new_group_socket(node_group, name, socket_type, in_out='INPUT'):
+    if hasattr(node_group, "interface"):
+        return node_group.interface.new_socket(name, in_out=in_out, socket_type=socket_type)
+    sockets = node_group.inputs if in_out == 'INPUT' else node_group.outputs
+    return sockets.new(socket_type, name)
+
+def get_group_input_identifiers(node_group):
+    if hasattr(node_group, "interface"):
+        return {item.name: item.identifier for item in node_group.interface.items_tree
+                if item.item_type == 'SOCKET' and item.in_out == 'INPUT'}
+    return {socket.name: socket.identifier for socket in node_group.inputs}
 
-    existing_modifier = None
+def enabled_sockets(sockets):
+    return [socket for socket in sockets if socket.enabled]
+
+def get_node_group_template(name, build_nodes):
+    node_group = bpy.data.node_groups.get(name)
+    if node_group is not None and node_group.get("blender_points_version") == NODE_GROUP_VERSION:
+        return node_group
+
+    template = new_geometry_node_group(name)
+    build_nodes(template)
+    template["blender_points_version"] = NODE_GROUP_VERSION
+
+    # Move modifiers still using an outdated template over to the rebuilt one
+    if node_group is not None:
+        node_group.user_remap(template)
+        bpy.data.node_groups.remove(node_group)
+        template.name = name
+    return template
+
+def get_nodes_modifier(selected_object):
     for mod in selected_object.modifiers:
         if mod.type == 'NODES':
-            existing_modifier = mod
-            break
+            return mod
+    return selected_object.modifiers.new(name="GeometryNodes", type='NODES')
 
-    if existing_modifier is None:
-        bpy.ops.object.modifier_add(type='NODES')
-        modifier = selected_object.modifiers[-1]
-    else:
-        modifier = existing_modifier
+def get_render_density(props):
+    if props.density_mode == 'POINT_COUNT' and props.surface_area > 0.0:
+        return props.target_point_count / props.surface_area
+    return props.density
+
+# Approximate evaluated size of one point (position, radius, id) and one instance (transform, reference)
+POINT_BYTES = 20
+INSTANCE_BYTES = 72
+
+# mesh pointer -> (surface area, vertex count), dropped when the mesh datablock changes
+mesh_statistics_cache = {}
+
+def get_mesh_statistics(mesh):
+    key = mesh.as_pointer()
+    statistics = mesh_statistics_cache.get(key)
+    if statistics is None:
+        statistics = mesh_statistics_cache[key] = (mesh_surface_area(mesh), len(mesh.vertices))
+    return statistics
+
+def refresh_surface_area(selected_object):
+    props = selected_object.blender_points_props
+    surface_area = get_mesh_statistics(selected_object.data)[0]
+    if abs(surface_area - props.surface_area) > 1e-6 * max(surface_area, 1.0):
+        props.surface_area = surface_area
+
+# mesh pointer -> octree over the mesh's vertex positions, dropped when the mesh changes.
+# The adaptive radius and the level of detail both start from its Morton order.
+octree_cache = {}
+
+def get_mesh_octree(mesh, positions):
+    key = mesh.as_pointer()
+    octree = octree_cache.get(key)
+    if octree is None or len(octree["order"]) != len(positions):
+        octree = octree_cache[key] = build_octree(positions, seed=0)
+    return octree
+
+@persistent
+def clear_mesh_caches(dummy):
+    # Also runs after undo and redo, which give every mesh a new pointer that may
+    # match a stale entry
+    octree_cache.clear()
+    mesh_checksum_cache.clear()
+    mesh_statistics_cache.clear()
+    mesh_update_counters.clear()
+    object_statistics_cache.clear()
+
+# Mean distance of every vertex to its nearest neighbours, read by the Mesh to Points template
+SPACING_ATTRIBUTE = "point_spacing"
+
+def refresh_point_spacing(selected_object):
+    mesh = selected_object.data
+    positions = read_vertex_positions(mesh).reshape(-1, 3)
+    spacing = knn_spacing(positions, selected_object.blender_points_props.radius_neighbors,
+                                        octree=get_mesh_octree(mesh, positions))
+    write_point_attribute(mesh, SPACING_ATTRIBUTE, spacing)
+    mesh[SPACING_ATTRIBUTE + "_source"] = get_spacing_source(selected_object)
+
+def get_spacing_source(selected_object):
+    # The mesh state and settings the spacing was computed from. It is stored on the mesh,
+    # so edits made before an undo or a reload are still noticed.
+    return f"{get_mesh_checksum(selected_object.data)}-{selected_object.blender_points_props.radius_neighbors}"
+
+# Position of every vertex in the progressive order divided by the vertex count, so
+# keeping the vertices below a fraction keeps an evenly spread subset
+LOD_RANK_ATTRIBUTE = "lod_rank"
+
+def refresh_lod_ranks(selected_object):
+    mesh = selected_object.data
+    positions = read_vertex_positions(mesh).reshape(-1, 3)
+    order = progressive_order(positions, octree=get_mesh_octree(mesh, positions))
+    ranks = np.empty(len(order), dtype=np.float32)
+    ranks[order] = np.arange(len(order), dtype=np.float32) / max(len(order), 1)
+    write_point_attribute(mesh, LOD_RANK_ATTRIBUTE, ranks)
+    mesh[LOD_RANK_ATTRIBUTE + "_source"] = get_mesh_checksum(mesh)
+
+def refresh_mesh_attributes(selected_object):
+    # Recomputes the vertex attributes Mesh to Points reads when they no longer match the mesh
+    mesh = selected_object.data
+    props = selected_object.blender_points_props
+    if props.radius_mode == 'ADAPTIVE' and (SPACING_ATTRIBUTE not in mesh.attributes
+                                            or mesh.get(SPACING_ATTRIBUTE + "_source") != get_spacing_source(selected_object)):
+        refresh_point_spacing(selected_object)
+    if LOD_RANK_ATTRIBUTE not in mesh.attributes or mesh.get(LOD_RANK_ATTRIBUTE + "_source") != get_mesh_checksum(mesh):
+        refresh_lod_ranks(selected_object)
 
-    if modifier.node_group is None:
-        bpy.ops.node.new_geometry_node_group_assign()
-        node_group = modifier.node_group
+# object name -> time of the last mesh or sampling settings change. Recomputing the Mesh to
+# Points attributes or the Distribute Points helpers is slow on dense meshes, so it waits
+# for the edits to settle, for edit mode to be left and for playback to stop.
+pending_mesh_attributes = {}
+MESH_ATTRIBUTE_IDLE_SECONDS = 0.5
+
+def schedule_mesh_attributes(selected_object):
+    pending_mesh_attributes[selected_object.name] = time.monotonic()
+    if not bpy.app.timers.is_registered(flush_mesh_attributes):
+        bpy.app.timers.register(flush_mesh_attributes, first_interval=MESH_ATTRIBUTE_IDLE_SECONDS)
+
+def flush_mesh_attributes():
+    if any(window.screen.is_animation_playing for window in bpy.context.window_manager.windows):
+        return MESH_ATTRIBUTE_IDLE_SECONDS
+    now = time.monotonic()
+    for object_name, changed in list(pending_mesh_attributes.items()):
+        selected_object = bpy.data.objects.get(object_name)
+        if selected_object is not None and (now - changed < MESH_ATTRIBUTE_IDLE_SECONDS or selected_object.mode == 'EDIT'):
+            continue
+        del pending_mesh_attributes[object_name]
+        if selected_object is None or selected_object.type != 'MESH':
+            continue
+        if selected_object.blender_points_props.selected_feature == 'MESH_TO_POINTS':
+            refresh_mesh_attributes(selected_object)
+        elif selected_object.blender_points_props.selected_feature == 'ADD_POINTS':
+            refresh_point_helpers(selected_object)
+    return MESH_ATTRIBUTE_IDLE_SECONDS if pending_mesh_attributes else None
+
+def estimate_point_cost(selected_object, statistics):
+    props = selected_object.blender_points_props
+    surface_area, vertex_count = statistics["surface_area"], statistics["vertices"]
+    if props.selected_feature == 'MESH_TO_POINTS':
+        render_points = viewport_points = int(vertex_count * 0.25 ** int(props.lod_level))
+        instancing = props.enable_points_mesh
     else:
-        node_group = modifier.node_group
+        render_points = int(get_render_density(props) * surface_area)
+        viewport_points = int(props.viewport_density * surface_area)
+        if props.viewport_point_budget > 0:
+            viewport_points = min(viewport_points, props.viewport_point_budget)
+        instancing = props.enable_points_add
+    instances = render_points if instancing else 0
+    memory = render_points * POINT_BYTES + instances * INSTANCE_BYTES
+    return render_points, viewport_points, instances, memory
+
+# object pointer -> panel statistics, refreshed from a timer so drawing never touches geometry
+object_statistics_cache = {}
+mesh_update_counters = {}  # mesh pointer -> number of depsgraph updates seen for that mesh
+pending_statistics = set()  # names of objects waiting for a refresh
+STATISTICS_PLAYBACK_INTERVAL = 0.5
+
+def get_object_statistics(selected_object):
+    statistics = object_statistics_cache.get(selected_object.as_pointer())
+    mesh_update = mesh_update_counters.get(selected_object.data.as_pointer(), 0)
+    if statistics is None or statistics["stale"] or statistics["mesh_update"] != mesh_update:
+        pending_statistics.add(selected_object.name)
+        if not bpy.app.timers.is_registered(refresh_object_statistics):
+            bpy.app.timers.register(refresh_object_statistics, first_interval=0.0)
+    return statistics
+
+def count_evaluated_points(depsgraph, objects):
+    # One pass over the evaluated instances for every requested object
+    counts = {obj.as_pointer(): [0, 0] for obj in objects}
+    for instance in depsgraph.object_instances:
+        if instance.is_instance:
+            owner = instance.parent.original.as_pointer() if instance.parent else None
+            if owner not in counts:
+                continue
+            if instance.object.type == 'POINTCLOUD':
+                counts[owner][0] += len(instance.object.data.points)
+            else:
+                counts[owner][1] += 1
+    return counts
+
+def refresh_object_statistics():
+    # Counting evaluated points walks every instance in the scene, so during playback,
+    # when deforming objects update every frame, the refresh waits for it to stop
+    if any(window.screen.is_animation_playing for window in bpy.context.window_manager.windows):
+        return STATISTICS_PLAYBACK_INTERVAL
+    objects = [bpy.data.objects.get(name) for name in pending_statistics]
+    objects = [obj for obj in objects if obj is not None and obj.type == 'MESH']
+    pending_statistics.clear()
+    if not objects:
+        return None
+
+    counts = count_evaluated_points(bpy.context.evaluated_depsgraph_get(), objects)
+    for obj in objects:
+        mesh = obj.data
+        surface_area, vertex_count = get_mesh_statistics(mesh)
+        evaluated_points, instances = counts[obj.as_pointer()]
+        object_statistics_cache[obj.as_pointer()] = {
+            "polygons": len(mesh.polygons),
+            "vertices": vertex_count,
+            "surface_area": surface_area,
+            "evaluated_points": evaluated_points,
+            "instances": instances,
+            "mesh_update": mesh_update_counters.get(mesh.as_pointer(), 0),
+            "stale": False,
+        }
+    tag_view3d_redraw()
+    return None
+
+def tag_view3d_redraw():
+    for window in bpy.context.window_manager.windows:
+        for area in window.screen.areas:
+            if area.type == 'VIEW_3D':
+                area.tag_redraw()
+
+
+# scene pointer -> the scene camera and render shape the point inputs were last written for
+scene_camera_states = {}
+
+def get_scene_camera_state(scene):
+    render = scene.render
+    camera = scene.camera.as_pointer() if scene.camera is not None else 0
+    return camera, render.resolution_x, render.resolution_y, render.pixel_aspect_x, render.pixel_aspect_y
 
-    if node_group is None:
+@persistent
+def update_camera_frustums(scene, depsgraph):
+    # The scene camera, lens, clipping, resolution and pixel aspect reach the templates as
+    # plain inputs, so follow their edits here. The last two only show up as Scene updates.
+    state = get_scene_camera_state(scene)
+    previous_state = scene_camera_states.get(scene.as_pointer())
+    scene_camera_states[scene.as_pointer()] = state
+    camera_changed = previous_state is None or previous_state[0] != state[0]
+    if previous_state == state and not any(isinstance(update.id, bpy.types.Camera) for update in depsgraph.updates):
         return
+    for selected_object in scene.objects:
+        if selected_object.type != 'MESH':
+            continue
+        props = selected_object.blender_points_props
+        if not props.points_modifier:
+            continue
+        if props.cull_viewport or props.cull_render:
+            for input_name in FRUSTUM_INPUTS:
+                write_point_input(selected_object, input_name)
+        elif camera_changed:
+            write_point_input(selected_object, "Camera")
+
+@persistent
+def update_mesh_caches(scene, depsgraph):
+    changed_meshes = set()
+    for update in depsgraph.updates:
+        if isinstance(update.id, bpy.types.Mesh):
+            key = update.id.original.as_pointer()
+            mesh_statistics_cache.pop(key, None)
+            mesh_checksum_cache.pop(key, None)
+            octree_cache.pop(key, None)
+            mesh_update_counters[key] = mesh_update_counters.get(key, 0) + 1
+            changed_meshes.add(key)
+        elif isinstance(update.id, bpy.types.Object):
+            key = update.id.original.as_pointer()
+            point_cache_status.pop(key, None)
+            statistics = object_statistics_cache.get(key)
+            if update.is_updated_geometry and statistics is not None:
+                statistics["stale"] = True
+    if not changed_meshes:
+        return
+
+    # Keep Point Count mode on target and the attributes and helpers current after the mesh is edited
+    for update in depsgraph.updates:
+        if not isinstance(update.id, bpy.types.Object):
+            continue
+        selected_object = update.id.original
+        if selected_object.type != 'MESH' or selected_object.data.as_pointer() not in changed_meshes:
+            continue
+        props = selected_object.blender_points_props
+        if props.density_mode == 'POINT_COUNT' and props.selected_feature == 'ADD_POINTS':
+            refresh_surface_area(selected_object)
+        if props.selected_feature in {'MESH_TO_POINTS', 'ADD_POINTS'}:
+            schedule_mesh_attributes(selected_object)
+
+def get_camera_frustum(camera, scene, margin):
+    # The view in camera space, depth = -z, is |x| <= size.x + slope.x * depth (and the same
+    # for y) between the clip distances. Perspective cameras have no size, orthographic no
+    # slope. The margin pushes every plane outwards by that distance.
+    frame = [corner.to_3d() for corner in camera.data.view_frame(scene=scene)]
+    if camera.data.type == 'ORTHO':
+        size, slope = [max(abs(corner[axis]) for corner in frame) for axis in (0, 1)], [0.0, 0.0]
+    else:
+        size, slope = [0.0, 0.0], [max(abs(corner[axis] / corner.z) for corner in frame) for axis in (0, 1)]
+    size = [size[axis] + margin * (1.0 + slope[axis] ** 2) ** 0.5 for axis in (0, 1)]
+    return (size[0], size[1], 0.0), (slope[0], slope[1], 0.0), camera.data.clip_start - margin, camera.data.clip_end + margin
+
+def get_scene_camera():
+    camera = bpy.context.scene.camera
+    return camera if camera is not None and camera.type == 'CAMERA' else None
+
+def get_frustum_input(index):
+    def get(selected_object, props, feature):
+        camera = get_scene_camera()
+        if camera is None:
+            return None
+        return get_camera_frustum(camera, bpy.context.scene, props.cull_margin)[index]
+    return get
+
+def get_feature_input(mesh_to_points_name, add_points_name):
+    def get(selected_object, props, feature):
+        return getattr(props, mesh_to_points_name if feature == 'MESH_TO_POINTS' else add_points_name)
+    return get
+
+def get_object_input(property_name):
+    def get(selected_object, props, feature):
+        return bpy.data.objects.get(getattr(props, property_name))
+    return get
 
+# Template input name -> getter(selected_object, props, feature), so writing one input
+# only computes that input's value
+POINT_INPUT_GETTERS = {
+    "Density": lambda selected_object, props, feature: get_render_density(props),
+    "Viewport Density": lambda selected_object, props, feature: props.viewport_density,
+    "Viewport Point Budget": lambda selected_object, props, feature: props.viewport_point_budget,
+    "Seed": lambda selected_object, props, feature: props.random,
+    "Radius": lambda selected_object, props, feature: props.radius,
+    "Adaptive Radius": lambda selected_object, props, feature: props.radius_mode == 'ADAPTIVE',
+    "Radius Factor": lambda selected_object, props, feature: props.radius_factor,
+    "LOD Fraction": lambda selected_object, props, feature: 0.25 ** int(props.lod_level),
+    "Camera Falloff": lambda selected_object, props, feature: props.use_camera_falloff,
+    "Camera": lambda selected_object, props, feature: get_scene_camera(),
+    "Frustum Size": get_frustum_input(0),
+    "Frustum Slope": get_frustum_input(1),
+    "Clip Start": get_frustum_input(2),
+    "Clip End": get_frustum_input(3),
+    "Cull Viewport": lambda selected_object, props, feature: props.cull_viewport and get_scene_camera() is not None,
+    "Cull Render": lambda selected_object, props, feature: props.cull_render and get_scene_camera() is not None,
+    "Poisson Points": lambda selected_object, props, feature: props.distribution_method == 'POISSON',
+    "Poisson Object": get_object_input("poisson_points_object"),
+    "Progressive Density": lambda selected_object, props, feature: props.use_progressive_density,
+    "Progressive Object": get_object_input("progressive_points_object"),
+    "Stable Points": lambda selected_object, props, feature: props.use_stable_points,
+    "Stable Object": get_object_input("stable_points_object"),
+    "Use Cache": lambda selected_object, props, feature: props.use_point_cache,
+    "Cache Object": get_object_input("point_cache_object"),
+    "Camera Near": lambda selected_object, props, feature: props.camera_near,
+    "Camera Far": lambda selected_object, props, feature: props.camera_far,
+    "Camera Min Density": lambda selected_object, props, feature: props.camera_min_density,
+    "Instancing": get_feature_input("enable_points_mesh", "enable_points_add"),
+    "Instance Object": lambda selected_object, props, feature: bpy.data.objects.get(
+        props.instance_object_mesh if feature == 'MESH_TO_POINTS' else props.instance_object_add),
+    "Scale": get_feature_input("scale_mesh", "scale_add"),
+    "Material": lambda selected_object, props, feature: selected_object.active_material or create_default_material(),
+}
+
+def get_point_settings(selected_object, props, feature):
+    return {name: get(selected_object, props, feature) for name, get in POINT_INPUT_GETTERS.items()}
+
+# Socket identifiers per (template name, template version)
+input_identifier_cache = {}
+
+def get_cached_input_identifiers(node_group):
+    key = (node_group.name, node_group.get("blender_points_version"))
+    identifiers = input_identifier_cache.get(key)
+    if identifiers is None:
+        identifiers = input_identifier_cache[key] = get_group_input_identifiers(node_group)
+    return identifiers
+
+def set_modifier_inputs(modifier, values):
+    identifiers = get_cached_input_identifiers(modifier.node_group)
+    for name, value in values.items():
+        identifier = identifiers.get(name)
+        if identifier is not None and value is not None:
+            modifier[identifier] = value
+
+POINT_SETTING_PROPERTIES = (
+    "radius", "radius_mode", "radius_factor", "radius_neighbors", "lod_level",
+    "use_camera_falloff", "camera_near", "camera_far", "camera_min_density", "cull_viewport", "cull_render", "cull_margin", "density", "density_mode", "target_point_count", "viewport_density", "viewport_point_budget", "random",
+    "enable_points_add", "instance_object_add", "scale_add",
+    "enable_points_mesh", "instance_object_mesh", "scale_mesh",
+    "distribution_method", "poisson_min_distance", "poisson_max_count",
+    "use_progressive_density", "progressive_max_density", "use_stable_points",
+)
+# Copied by Apply to Selection, but the baked frames themselves stay per object
+POINT_CACHE_PROPERTIES = ("point_cache_directory", "point_cache_start", "point_cache_end")
+
+def copy_point_settings(source_props, target_props):
+    # Copies the stored values without running the update callbacks, so nothing is
+    # written per property; assign_point_template writes every input once afterwards.
+    for name in POINT_SETTING_PROPERTIES + POINT_CACHE_PROPERTIES:
+        if name in source_props:
+            target_props[name] = source_props[name]
+        else:
+            target_props.property_unset(name)
+
+def build_point_helpers(selected_object, props):
+    # The hidden point sets the enabled Distribute Points options read from
+    if props.distribution_method == 'POISSON' and bpy.data.objects.get(props.poisson_points_object) is None:
+        try:
+            build_poisson_points(selected_object)
+        except ValueError:
+            pass  # kept in poisson_error, the template still applies without the points
+    if props.use_progressive_density and bpy.data.objects.get(props.progressive_points_object) is None:
+        build_progressive_points(selected_object)
+    if props.use_stable_points and bpy.data.objects.get(props.stable_points_object) is None:
+        sample_stable_points(selected_object)
+
+def assign_point_template(selected_object, props, feature):
+    if feature == 'ADD_POINTS':
+        node_group = get_node_group_template(DISTRIBUTE_POINTS_GROUP, build_distribute_points_nodes)
+    else:
+        node_group = get_node_group_template(MESH_TO_POINTS_GROUP, build_mesh_to_points_nodes)
+
+    if props.density_mode == 'POINT_COUNT':
+        refresh_surface_area(selected_object)
+    if feature == 'MESH_TO_POINTS':
+        refresh_mesh_attributes(selected_object)
+    if feature == 'ADD_POINTS':
+        build_point_helpers(selected_object, props)
+
+    modifier = get_nodes_modifier(selected_object)
+    modifier.node_group = node_group
+    selected_object.blender_points_props.selected_feature = feature
+    selected_object.blender_points_props.points_modifier = modifier.name
+    set_modifier_inputs(modifier, get_point_settings(selected_object, props, feature))
+    selected_object.update_tag(refresh={'DATA'})
+    return modifier
+
+def apply_distribute_points(context):
+    selected_object = context.active_object
+    props = selected_object.blender_points_props  # Use object property
+
+    assign_point_template(selected_object, props, 'ADD_POINTS')
+
+    # Force update to ensure changes are reflected immediately
+    bpy.context.view_layer.objects.active = selected_object
+    bpy.context.view_layer.update()
+
+def new_math_node(node_group, operation, location):
+    math = node_group.nodes.new(type="ShaderNodeMath")
+    math.operation = operation
+    math.location = location
+    return math
+
+def new_switch_node(node_group, input_type, location):
+    switch = node_group.nodes.new(type="GeometryNodeSwitch")
+    switch.input_type = input_type
+    switch.location = location
+    return switch
+
+def new_culling_sockets(node_group):
+    new_group_socket(node_group, "Cull Viewport", 'NodeSocketBool')
+    new_group_socket(node_group, "Cull Render", 'NodeSocketBool')
+    new_group_socket(node_group, "Frustum Size", 'NodeSocketVector')
+    new_group_socket(node_group, "Frustum Slope", 'NodeSocketVector')
+    new_group_socket(node_group, "Clip Start", 'NodeSocketFloat')
+    new_group_socket(node_group, "Clip End", 'NodeSocketFloat')
+
+def new_vector_math_node(node_group, operation, location):
+    vector_math = node_group.nodes.new(type="ShaderNodeVectorMath")
+    vector_math.operation = operation
+    vector_math.location = location
+    return vector_math
+
+def new_world_position_nodes(node_group, location):
+    # Position in world space from the modifier object's own transform, which keeps
+    # distances right on scaled objects where the relative space does not
     nodes = node_group.nodes
     links = node_group.links
+    x, y = location
 
-    group_input = nodes.get('Group Input') or nodes.new('NodeGroupInput')
-    group_output = nodes.get('Group Output') or nodes.new('NodeGroupOutput')
+    self_object = nodes.new(type="GeometryNodeSelfObject")
+    self_object.location = (x - 600, y)
+    self_info = nodes.new(type="GeometryNodeObjectInfo")
+    self_info.transform_space = 'ORIGINAL'
+    self_info.location = (x - 400, y)
+    links.new(self_object.outputs['Self Object'], self_info.inputs['Object'])
+    position = nodes.new(type="GeometryNodeInputPosition")
+    position.location = (x - 400, y - 250)
+
+    scaled = new_vector_math_node(node_group, 'MULTIPLY', (x - 200, y - 250))
+    links.new(position.outputs['Position'], scaled.inputs[0])
+    links.new(self_info.outputs['Scale'], scaled.inputs[1])
+    rotate = nodes.new(type="ShaderNodeVectorRotate")
+    rotate.rotation_type = 'EULER_XYZ'
+    rotate.location = (x, y - 250)
+    links.new(scaled.outputs['Vector'], rotate.inputs['Vector'])
+    links.new(self_info.outputs['Rotation'], rotate.inputs['Rotation'])
+    world_position = new_vector_math_node(node_group, 'ADD', (x + 200, y - 250))
+    links.new(rotate.outputs['Vector'], world_position.inputs[0])
+    links.new(self_info.outputs['Location'], world_position.inputs[1])
+    return world_position.outputs['Vector']
+
+def build_frustum_culling_nodes(node_group, points_socket, location):
+    # Deletes the points outside the Camera's view (see get_camera_frustum). The points and
+    # the camera are both taken to world space, so only the lens and clipping come from Python.
+    # The relative space would fold a non-uniform object scale into the camera rotation.
+    nodes = node_group.nodes
+    links = node_group.links
+    group_input = nodes['Group Input']
+    x, y = location
+
+    camera_info = nodes.new(type="GeometryNodeObjectInfo")
+    camera_info.transform_space = 'ORIGINAL'
+    camera_info.location = (x - 1400, y - 300)
+    world_position = new_world_position_nodes(node_group, (x - 1400, y - 550))
+    links.new(group_input.outputs['Camera'], camera_info.inputs['Object'])
+
+    offset = new_vector_math_node(node_group, 'SUBTRACT', (x - 1200, y - 300))
+    links.new(world_position, offset.inputs[0])
+    links.new(camera_info.outputs['Location'], offset.inputs[1])
+    unrotate = nodes.new(type="ShaderNodeVectorRotate")
+    unrotate.rotation_type = 'EULER_XYZ'
+    unrotate.invert = True
+    unrotate.location = (x - 1000, y - 300)
+    links.new(offset.outputs['Vector'], unrotate.inputs['Vector'])
+    links.new(camera_info.outputs['Rotation'], unrotate.inputs['Rotation'])
+    camera_space = new_vector_math_node(node_group, 'DIVIDE', (x - 800, y - 300))
+    links.new(unrotate.outputs['Vector'], camera_space.inputs[0])
+    links.new(camera_info.outputs['Scale'], camera_space.inputs[1])
+
+    separate = nodes.new(type="ShaderNodeSeparateXYZ")
+    separate.location = (x - 600, y - 450)
+    links.new(camera_space.outputs['Vector'], separate.inputs['Vector'])
+    depth = new_math_node(node_group, 'MULTIPLY', (x - 400, y - 450))
+    links.new(separate.outputs['Z'], depth.inputs[0])
+    depth.inputs[1].default_value = -1.0
+
+    # How far each point lies outside the side planes, positive when outside
+    extent = new_vector_math_node(node_group, 'SCALE', (x - 400, y - 300))
+    links.new(group_input.outputs['Frustum Slope'], extent.inputs[0])
+    links.new(depth.outputs['Value'], extent.inputs['Scale'])
+    bound = new_vector_math_node(node_group, 'ADD', (x - 200, y - 300))
+    links.new(extent.outputs['Vector'], bound.inputs[0])
+    links.new(group_input.outputs['Frustum Size'], bound.inputs[1])
+    absolute = new_vector_math_node(node_group, 'ABSOLUTE', (x - 600, y - 200))
+    links.new(camera_space.outputs['Vector'], absolute.inputs[0])
+    excess = new_vector_math_node(node_group, 'SUBTRACT', (x, y - 300))
+    links.new(absolute.outputs['Vector'], excess.inputs[0])
+    links.new(bound.outputs['Vector'], excess.inputs[1])
+    separate_excess = nodes.new(type="ShaderNodeSeparateXYZ")
+    separate_excess.location = (x + 200, y - 300)
+    links.new(excess.outputs['Vector'], separate_excess.inputs['Vector'])
+
+    outside = new_math_node(node_group, 'MAXIMUM', (x + 400, y - 300))
+    links.new(separate_excess.outputs['X'], outside.inputs[0])
+    links.new(separate_excess.outputs['Y'], outside.inputs[1])
+    too_near = new_math_node(node_group, 'LESS_THAN', (x - 200, y - 500))
+    links.new(depth.outputs['Value'], too_near.inputs[0])
+    links.new(group_input.outputs['Clip Start'], too_near.inputs[1])
+    too_far = new_math_node(node_group, 'GREATER_THAN', (x - 200, y - 650))
+    links.new(depth.outputs['Value'], too_far.inputs[0])
+    links.new(group_input.outputs['Clip End'], too_far.inputs[1])
+    clipped = new_math_node(node_group, 'MAXIMUM', (x, y - 550))
+    links.new(too_near.outputs['Value'], clipped.inputs[0])
+    links.new(too_far.outputs['Value'], clipped.inputs[1])
+    culled = new_math_node(node_group, 'MAXIMUM', (x + 600, y - 400))
+    links.new(outside.outputs['Value'], culled.inputs[0])
+    links.new(clipped.outputs['Value'], culled.inputs[1])
+
+    is_viewport = nodes.new(type="GeometryNodeIsViewport")
+    is_viewport.location = (x + 400, y - 100)
+    cull_switch = new_switch_node(node_group, 'BOOLEAN', (x + 600, y - 150))
+    switch_input, false_input, true_input = enabled_sockets(cull_switch.inputs)
+    links.new(is_viewport.outputs['Is Viewport'], switch_input)
+    links.new(group_input.outputs['Cull Render'], false_input)
+    links.new(group_input.outputs['Cull Viewport'], true_input)
+    selection = nodes.new(type="FunctionNodeBooleanMath")
+    selection.operation = 'AND'
+    selection.location = (x + 800, y - 200)
+    links.new(enabled_sockets(cull_switch.outputs)[0], selection.inputs[0])
+    links.new(culled.outputs['Value'], selection.inputs[1])
+
+    delete_culled = nodes.new(type="GeometryNodeDeleteGeometry")
+    delete_culled.domain = 'POINT'
+    delete_culled.location = (x + 1000, y)
+    links.new(points_socket, delete_culled.inputs['Geometry'])
+    links.new(selection.outputs['Boolean'], delete_culled.inputs['Selection'])
+    return delete_culled.outputs['Geometry']
+
+def build_poisson_points_nodes(node_group, points_socket, location):
+    # With Poisson Points on, the points come from the point cloud written by the
+    # CPU sampler (a vertex-only mesh where point clouds cannot be created).
+    nodes = node_group.nodes
+    links = node_group.links
+    group_input = nodes['Group Input']
+    x, y = location
+
+    poisson_info = nodes.new(type="GeometryNodeObjectInfo")
+    poisson_info.transform_space = 'ORIGINAL'
+    poisson_info.location = (x - 1000, y)
+    components = nodes.new(type="GeometryNodeSeparateComponents")
+    components.location = (x - 800, y)
+    mesh_points = nodes.new(type="GeometryNodeMeshToPoints")
+    mesh_points.location = (x - 600, y - 150)
+    join = nodes.new(type="GeometryNodeJoinGeometry")
+    join.location = (x - 400, y)
+    set_radius = nodes.new(type="GeometryNodeSetPointRadius")
+    set_radius.location = (x - 200, y + 150)
+    links.new(group_input.outputs['Poisson Object'], poisson_info.inputs['Object'])
+    links.new(poisson_info.outputs['Geometry'], components.inputs['Geometry'])
+    links.new(components.outputs['Mesh'], mesh_points.inputs['Mesh'])
+    links.new(mesh_points.outputs['Points'], join.inputs['Geometry'])
+    links.new(components.outputs['Point Cloud'], join.inputs['Geometry'])
+    links.new(join.outputs['Geometry'], set_radius.inputs['Points'])
+    links.new(group_input.outputs['Radius'], set_radius.inputs['Radius'])
+
+    switch = new_switch_node(node_group, 'GEOMETRY', (x, y))
+    switch_input, false_input, true_input = enabled_sockets(switch.inputs)
+    links.new(group_input.outputs['Poisson Points'], switch_input)
+    links.new(points_socket, false_input)
+    links.new(set_radius.outputs['Points'], true_input)
+    return enabled_sockets(switch.outputs)[0]
+
+def build_progressive_density_nodes(node_group, points_socket, density_socket, location):
+    # With Progressive Density on, the points are the precomputed samples with an index
+    # below density x surface area. The density field is read at every sample, so the
+    # camera falloff thins the prefix locally.
+    nodes = node_group.nodes
+    links = node_group.links
+    group_input = nodes['Group Input']
+    x, y = location
+
+    progressive_info = nodes.new(type="GeometryNodeObjectInfo")
+    progressive_info.transform_space = 'ORIGINAL'
+    progressive_info.location = (x - 1000, y)
+    progressive_points = nodes.new(type="GeometryNodeMeshToPoints")
+    progressive_points.location = (x - 800, y)
+    links.new(group_input.outputs['Progressive Object'], progressive_info.inputs['Object'])
+    links.new(progressive_info.outputs['Geometry'], progressive_points.inputs['Mesh'])
+    links.new(group_input.outputs['Radius'], progressive_points.inputs['Radius'])
+
+    face_area = nodes.new(type="GeometryNodeInputMeshFaceArea")
+    area_statistic = nodes.new(type="GeometryNodeAttributeStatistic")
+    area_statistic.domain = 'FACE'
+    face_area.location = (x - 1000, y - 300)
+    area_statistic.location = (x - 800, y - 300)
+    links.new(group_input.outputs['Geometry'], area_statistic.inputs['Geometry'])
+    links.new(face_area.outputs['Area'], area_statistic.inputs['Attribute'])
+
+    point_limit = new_math_node(node_group, 'MULTIPLY', (x - 600, y - 300))
+    links.new(density_socket, point_limit.inputs[0])
+    links.new(area_statistic.outputs['Sum'], point_limit.inputs[1])
+    index = nodes.new(type="GeometryNodeInputIndex")
+    index.location = (x - 600, y - 150)
+    past_limit = nodes.new(type="FunctionNodeCompare")
+    past_limit.data_type = 'FLOAT'
+    past_limit.operation = 'GREATER_EQUAL'
+    past_limit.location = (x - 400, y - 200)
+    links.new(index.outputs['Index'], past_limit.inputs[0])
+    links.new(point_limit.outputs['Value'], past_limit.inputs[1])
+
+    truncate = nodes.new(type="GeometryNodeDeleteGeometry")
+    truncate.domain = 'POINT'
+    truncate.location = (x - 400, y)
+    links.new(progressive_points.outputs['Points'], truncate.inputs['Geometry'])
+    links.new(past_limit.outputs['Result'], truncate.inputs['Selection'])
+
+    switch = new_switch_node(node_group, 'GEOMETRY', (x - 200, y))
+    switch_input, false_input, true_input = enabled_sockets(switch.inputs)
+    links.new(group_input.outputs['Progressive Density'], switch_input)
+    links.new(points_socket, false_input)
+    links.new(truncate.outputs['Geometry'], true_input)
+    return enabled_sockets(switch.outputs)[0]
+
+def build_stable_points_nodes(node_group, points_socket, location):
+    # With Stable Points on, every rest pose sample is placed on the incoming (deformed)
+    # mesh by blending the positions of its three triangle vertices with its weights.
+    nodes = node_group.nodes
+    links = node_group.links
+    group_input = nodes['Group Input']
+    x, y = location
+
+    stable_info = nodes.new(type="GeometryNodeObjectInfo")
+    stable_info.transform_space = 'ORIGINAL'
+    stable_info.location = (x - 1600, y)
+    stable_points = nodes.new(type="GeometryNodeMeshToPoints")
+    stable_points.location = (x - 1400, y)
+    links.new(group_input.outputs['Stable Object'], stable_info.inputs['Object'])
+    links.new(stable_info.outputs['Geometry'], stable_points.inputs['Mesh'])
+    links.new(group_input.outputs['Radius'], stable_points.inputs['Radius'])
+
+    weights = nodes.new(type="GeometryNodeInputNamedAttribute")
+    weights.data_type = 'FLOAT_VECTOR'
+    weights.inputs['Name'].default_value = "barycentric"
+    weights.location = (x - 1400, y - 700)
+    separate_weights = nodes.new(type="ShaderNodeSeparateXYZ")
+    separate_weights.location = (x - 1200, y - 700)
+    links.new(enabled_sockets(weights.outputs)[0], separate_weights.inputs['Vector'])
+    position = nodes.new(type="GeometryNodeInputPosition")
+    position.location = (x - 1400, y - 200)
+
+    blended = None
+    for corner, (name, weight) in enumerate(zip(SAMPLE_VERTEX_NAMES, ('X', 'Y', 'Z'))):
+        vertex_index = nodes.new(type="GeometryNodeInputNamedAttribute")
+        vertex_index.data_type = 'INT'
+        vertex_index.inputs['Name'].default_value = name
+        vertex_index.location = (x - 1200, y - 200 - corner * 150)
+        sample = nodes.new(type="GeometryNodeSampleIndex")
+        sample.data_type = 'FLOAT_VECTOR'
+        sample.domain = 'POINT'
+        sample.location = (x - 1000, y - 200 - corner * 150)
+        links.new(group_input.outputs['Geometry'], sample.inputs['Geometry'])
+        value_input = [socket for socket in enabled_sockets(sample.inputs) if socket.name == 'Value'][0]
+        links.new(position.outputs['Position'], value_input)
+        links.new(enabled_sockets(vertex_index.outputs)[0], sample.inputs['Index'])
+
+        weighted = new_vector_math_node(node_group, 'SCALE', (x - 800, y - 200 - corner * 150))
+        links.new(enabled_sockets(sample.outputs)[0], weighted.inputs[0])
+        links.new(separate_weights.outputs[weight], weighted.inputs['Scale'])
+        if blended is None:
+            blended = weighted.outputs['Vector']
+        else:
+            total = new_vector_math_node(node_group, 'ADD', (x - 600, y - 200 - corner * 150))
+            links.new(blended, total.inputs[0])
+            links.new(weighted.outputs['Vector'], total.inputs[1])
+            blended = total.outputs['Vector']
+
+    set_position = nodes.new(type="GeometryNodeSetPosition")
+    set_position.location = (x - 400, y)
+    links.new(stable_points.outputs['Points'], set_position.inputs['Geometry'])
+    links.new(blended, set_position.inputs['Position'])
+
+    switch = new_switch_node(node_group, 'GEOMETRY', (x - 200, y))
+    switch_input, false_input, true_input = enabled_sockets(switch.inputs)
+    links.new(group_input.outputs['Stable Points'], switch_input)
+    links.new(points_socket, false_input)
+    links.new(set_position.outputs['Geometry'], true_input)
+    return enabled_sockets(switch.outputs)[0]
+
+def build_point_cache_nodes(node_group, points_socket, location):
+    # With Use Cache on, the points come from Cache Object, which holds the baked
+    # world-space points of the current frame, instead of the generated ones.
+    nodes = node_group.nodes
+    links = node_group.links
+    group_input = nodes['Group Input']
+    x, y = location
+
+    cache_info = nodes.new(type="GeometryNodeObjectInfo")
+    cache_info.transform_space = 'RELATIVE'
+    cache_info.location = (x - 600, y)
+    cached_radius = nodes.new(type="GeometryNodeInputNamedAttribute")
+    cached_radius.data_type = 'FLOAT'
+    cached_radius.inputs['Name'].default_value = "radius"
+    cached_radius.location = (x - 600, y - 250)
+    cached_points = nodes.new(type="GeometryNodeMeshToPoints")
+    cached_points.location = (x - 400, y)
+    links.new(group_input.outputs['Cache Object'], cache_info.inputs['Object'])
+    links.new(cache_info.outputs['Geometry'], cached_points.inputs['Mesh'])
+    links.new(enabled_sockets(cached_radius.outputs)[0], cached_points.inputs['Radius'])
+
+    switch = new_switch_node(node_group, 'GEOMETRY', (x - 200, y))
+    switch_input, false_input, true_input = enabled_sockets(switch.inputs)
+    links.new(group_input.outputs['Use Cache'], switch_input)
+    links.new(points_socket, false_input)
+    links.new(cached_points.outputs['Points'], true_input)
+    return enabled_sockets(switch.outputs)[0]
+
+def build_instancing_nodes(node_group, points_socket, location):
+    nodes = node_group.nodes
+    links = node_group.links
+    group_input = nodes['Group Input']
+    x, y = location
+
+    points_socket = build_frustum_culling_nodes(node_group, points_socket, (x - 1200, y + 400))
 
-    distribute_points = nodes.new(type="GeometryNodeDistributePointsOnFaces")
-    set_point_radius = nodes.new(type="GeometryNodeSetPointRadius")
     object_info = nodes.new(type="GeometryNodeObjectInfo")
     instance_on_points = nodes.new(type="GeometryNodeInstanceOnPoints")
+    switch = new_switch_node(node_group, 'GEOMETRY', (x + 400, y))
+
+    object_info.location = (x, y - 250)
+    instance_on_points.location = (x + 200, y)
+
+    links.new(group_input.outputs['Instance Object'], object_info.inputs['Object'])
+    links.new(points_socket, instance_on_points.inputs['Points'])
+    links.new(object_info.outputs['Geometry'], instance_on_points.inputs['Instance'])
+    links.new(group_input.outputs['Scale'], instance_on_points.inputs['Scale'])
+
+    switch_input, false_input, true_input = enabled_sockets(switch.inputs)
+    links.new(group_input.outputs['Instancing'], switch_input)
+    links.new(points_socket, false_input)
+    links.new(instance_on_points.outputs['Instances'], true_input)
+    return enabled_sockets(switch.outputs)[0]
+
+def build_density_nodes(node_group, location):
+    # Render uses Density. The viewport uses Viewport Density, capped so the
+    # surface area times density stays under Viewport Point Budget (0 = no cap).
+    nodes = node_group.nodes
+    links = node_group.links
+    group_input = nodes['Group Input']
+    x, y = location
+
+    face_area = nodes.new(type="GeometryNodeInputMeshFaceArea")
+    area_statistic = nodes.new(type="GeometryNodeAttributeStatistic")
+    area_statistic.domain = 'FACE'
+    face_area.location = (x - 400, y - 150)
+    area_statistic.location = (x - 200, y - 150)
+    links.new(group_input.outputs['Geometry'], area_statistic.inputs['Geometry'])
+    links.new(face_area.outputs['Area'], area_statistic.inputs['Attribute'])
+
+    budget_density = new_math_node(node_group, 'DIVIDE', (x, y - 150))
+    links.new(group_input.outputs['Viewport Point Budget'], budget_density.inputs[0])
+    links.new(area_statistic.outputs['Sum'], budget_density.inputs[1])
+
+    capped_density = new_math_node(node_group, 'MINIMUM', (x + 200, y - 150))
+    links.new(group_input.outputs['Viewport Density'], capped_density.inputs[0])
+    links.new(budget_density.outputs['Value'], capped_density.inputs[1])
+
+    has_budget = new_math_node(node_group, 'GREATER_THAN', (x + 200, y))
+    links.new(group_input.outputs['Viewport Point Budget'], has_budget.inputs[0])
+    has_budget.inputs[1].default_value = 0.0
+
+    budget_switch = new_switch_node(node_group, 'FLOAT', (x + 400, y))
+    switch_input, false_input, true_input = enabled_sockets(budget_switch.inputs)
+    links.new(has_budget.outputs['Value'], switch_input)
+    links.new(group_input.outputs['Viewport Density'], false_input)
+    links.new(capped_density.outputs['Value'], true_input)
+
+    is_viewport = nodes.new(type="GeometryNodeIsViewport")
+    is_viewport.location = (x + 400, y + 150)
+    viewport_switch = new_switch_node(node_group, 'FLOAT', (x + 600, y))
+    switch_input, false_input, true_input = enabled_sockets(viewport_switch.inputs)
+    links.new(is_viewport.outputs['Is Viewport'], switch_input)
+    links.new(group_input.outputs['Density'], false_input)
+    links.new(enabled_sockets(budget_switch.outputs)[0], true_input)
+    return enabled_sockets(viewport_switch.outputs)[0]
+
+def build_camera_falloff_nodes(node_group, density_socket, location):
+    # Scales the density field from 1 at Camera Near down to Camera Min Density at
+    # Camera Far, measured in world space from the Camera input.
+    nodes = node_group.nodes
+    links = node_group.links
+    group_input = nodes['Group Input']
+    x, y = location
+
+    camera_info = nodes.new(type="GeometryNodeObjectInfo")
+    camera_info.transform_space = 'ORIGINAL'
+    camera_info.location = (x - 600, y - 150)
+    world_position = new_world_position_nodes(node_group, (x - 1000, y - 300))
+    distance = new_vector_math_node(node_group, 'DISTANCE', (x - 400, y - 150))
+    links.new(group_input.outputs['Camera'], camera_info.inputs['Object'])
+    links.new(camera_info.outputs['Location'], distance.inputs[0])
+    links.new(world_position, distance.inputs[1])
+
+    falloff = nodes.new(type="ShaderNodeMapRange")
+    falloff.data_type = 'FLOAT'
+    falloff.clamp = True
+    falloff.location = (x - 200, y - 150)
+    links.new(distance.outputs['Value'], falloff.inputs[0])
+    links.new(group_input.outputs['Camera Near'], falloff.inputs[1])
+    links.new(group_input.outputs['Camera Far'], falloff.inputs[2])
+    falloff.inputs[3].default_value = 1.0
+    links.new(group_input.outputs['Camera Min Density'], falloff.inputs[4])
+
+    scaled_density = new_math_node(node_group, 'MULTIPLY', (x, y - 150))
+    links.new(density_socket, scaled_density.inputs[0])
+    links.new(falloff.outputs['Result'], scaled_density.inputs[1])
+
+    switch = new_switch_node(node_group, 'FLOAT', (x + 200, y))
+    switch_input, false_input, true_input = enabled_sockets(switch.inputs)
+    links.new(group_input.outputs['Camera Falloff'], switch_input)
+    links.new(density_socket, false_input)
+    links.new(scaled_density.outputs['Value'], true_input)
+    return enabled_sockets(switch.outputs)[0]
+
+def build_distribute_points_nodes(node_group):
+    nodes = node_group.nodes
+    links = node_group.links
+
+    new_group_socket(node_group, "Density", 'NodeSocketFloat')
+    new_group_socket(node_group, "Viewport Density", 'NodeSocketFloat')
+    new_group_socket(node_group, "Viewport Point Budget", 'NodeSocketInt')
+    new_group_socket(node_group, "Camera Falloff", 'NodeSocketBool')
+    new_group_socket(node_group, "Camera", 'NodeSocketObject')
+    new_group_socket(node_group, "Camera Near", 'NodeSocketFloat')
+    new_group_socket(node_group, "Camera Far", 'NodeSocketFloat')
+    new_group_socket(node_group, "Camera Min Density", 'NodeSocketFloat')
+    new_group_socket(node_group, "Poisson Points", 'NodeSocketBool')
+    new_group_socket(node_group, "Poisson Object", 'NodeSocketObject')
+    new_group_socket(node_group, "Progressive Density", 'NodeSocketBool')
+    new_group_socket(node_group, "Progressive Object", 'NodeSocketObject')
+    new_group_socket(node_group, "Stable Points", 'NodeSocketBool')
+    new_group_socket(node_group, "Stable Object", 'NodeSocketObject')
+    new_culling_sockets(node_group)
+    new_group_socket(node_group, "Use Cache", 'NodeSocketBool')
+    new_group_socket(node_group, "Cache Object", 'NodeSocketObject')
+    new_group_socket(node_group, "Seed", 'NodeSocketInt')
+    new_group_socket(node_group, "Radius", 'NodeSocketFloat')
+    new_group_socket(node_group, "Instancing", 'NodeSocketBool')
+    new_group_socket(node_group, "Instance Object", 'NodeSocketObject')
+    new_group_socket(node_group, "Scale", 'NodeSocketFloat')
+    new_group_socket(node_group, "Material", 'NodeSocketMaterial')
+
+    group_input = nodes['Group Input']
+    group_output = nodes['Group Output']
+
+    distribute_points = nodes.new(type="GeometryNodeDistributePointsOnFaces")
+    set_point_radius = nodes.new(type="GeometryNodeSetPointRadius")
     set_material = nodes.new(type="GeometryNodeSetMaterial")
 
     distribute_points.location = (0, 0)
     set_point_radius.location = (300, 0)
-    object_info.location = (500, 0)
-    instance_on_points.location = (700, 0)
-    set_material.location = (900, 0)
-
-    if selected_object.active_material:
-        set_material.inputs['Material'].default_value = selected_object.active_material
-    else:
-        set_material.inputs['Material'].default_value = create_default_material()
+    set_material.location = (1100, 0)
 
     links.new(group_input.outputs['Geometry'], distribute_points.inputs['Mesh'])
+    density = build_density_nodes(node_group, (-1100, -300))
+    density = build_camera_falloff_nodes(node_group, density, (-300, -300))
+    links.new(density, distribute_points.inputs['Density'])
+    links.new(group_input.outputs['Seed'], distribute_points.inputs['Seed'])
     links.new(distribute_points.outputs['Points'], set_point_radius.inputs['Points'])
-    links.new(set_point_radius.outputs['Points'], instance_on_points.inputs['Points'])
-    links.new(object_info.outputs['Geometry'], instance_on_points.inputs['Instance'])
-    links.new(instance_on_points.outputs['Instances'], set_material.inputs['Geometry'])
-    links.new(set_material.outputs['Geometry'], group_output.inputs['Geometry'])
-
-    distribute_points.inputs['Density'].default_value = props.density
-    set_point_radius.inputs['Radius'].default_value = props.radius
-    distribute_points.inputs['Seed'].default_value = props.random
+    links.new(group_input.outputs['Radius'], set_point_radius.inputs['Radius'])
 
-    instance_on_points.mute = True  # Mute the instance on points node by default
-
-    # Force update to ensure changes are reflected immediately
-    bpy.context.view_layer.objects.active = selected_object
-    selected_object.update_tag(refresh={'DATA'})
-    bpy.context.view_layer.update()
+    points = build_poisson_points_nodes(node_group, set_point_radius.outputs['Points'], (400, 2100))
+    points = build_progressive_density_nodes(node_group, points, density, (400, 1500))
+    points = build_stable_points_nodes(node_group, points, (400, 900))
+    points = build_point_cache_nodes(node_group, points, (400, 300))
+    points = build_instancing_nodes(node_group, points, (500, 0))
+    links.new(points, set_material.inputs['Geometry'])
+    links.new(group_input.outputs['Material'], set_material.inputs['Material'])
+    links.new(set_material.outputs['Geometry'], group_output.inputs['Geometry'])
 
 def apply_mesh_to_points(context):
     selected_object = context.active_object
     props = selected_object.blender_points_props  # Use object property
 
-    existing_modifier = None
-    for mod in selected_object.modifiers:
-        if mod.type == 'NODES':
-            existing_modifier = mod
-            break
+    assign_point_template(selected_object, props, 'MESH_TO_POINTS')
 
-    if existing_modifier is None:
-        bpy.ops.object.modifier_add(type='NODES')
-        modifier = selected_object.modifiers[-1]
-    else:
-        modifier = existing_modifier
+def build_radius_nodes(node_group, location):
+    # Radius, or the stored neighbour spacing times Radius Factor when Adaptive Radius is on
+    nodes = node_group.nodes
+    links = node_group.links
+    group_input = nodes['Group Input']
+    x, y = location
 
-    if modifier.node_group is None:
-        bpy.ops.node.new_geometry_node_group_assign()
-        node_group = modifier.node_group
-    else:
-        node_group = modifier.node_group
+    spacing = nodes.new(type="GeometryNodeInputNamedAttribute")
+    spacing.data_type = 'FLOAT'
+    spacing.inputs['Name'].default_value = SPACING_ATTRIBUTE
+    spacing.location = (x - 400, y - 150)
+    scaled = new_math_node(node_group, 'MULTIPLY', (x - 200, y - 150))
+    links.new(enabled_sockets(spacing.outputs)[0], scaled.inputs[0])
+    links.new(group_input.outputs['Radius Factor'], scaled.inputs[1])
 
-    if node_group is None:
-        return
+    switch = new_switch_node(node_group, 'FLOAT', (x, y))
+    switch_input, false_input, true_input = enabled_sockets(switch.inputs)
+    links.new(group_input.outputs['Adaptive Radius'], switch_input)
+    links.new(group_input.outputs['Radius'], false_input)
+    links.new(scaled.outputs['Value'], true_input)
+    return enabled_sockets(switch.outputs)[0]
 
+def build_mesh_to_points_nodes(node_group):
     nodes = node_group.nodes
     links = node_group.links
 
-    group_input = nodes.get('Group Input') or nodes.new('NodeGroupInput')
-    group_output = nodes.get('Group Output') or nodes.new('NodeGroupOutput')
+    new_group_socket(node_group, "Radius", 'NodeSocketFloat')
+    new_group_socket(node_group, "Adaptive Radius", 'NodeSocketBool')
+    new_group_socket(node_group, "Radius Factor", 'NodeSocketFloat')
+    new_group_socket(node_group, "LOD Fraction", 'NodeSocketFloat')
+    new_group_socket(node_group, "Camera", 'NodeSocketObject')
+    new_culling_sockets(node_group)
+    new_group_socket(node_group, "Use Cache", 'NodeSocketBool')
+    new_group_socket(node_group, "Cache Object", 'NodeSocketObject')
+    new_group_socket(node_group, "Instancing", 'NodeSocketBool')
+    new_group_socket(node_group, "Instance Object", 'NodeSocketObject')
+    new_group_socket(node_group, "Scale", 'NodeSocketFloat')
+    new_group_socket(node_group, "Material", 'NodeSocketMaterial')
+
+    group_input = nodes['Group Input']
+    group_output = nodes['Group Output']
 
     mesh_to_points = nodes.new(type="GeometryNodeMeshToPoints")
-    object_info = nodes.new(type="GeometryNodeObjectInfo")
-    instance_on_points = nodes.new(type="GeometryNodeInstanceOnPoints")
     set_material = nodes.new(type="GeometryNodeSetMaterial")
 
     mesh_to_points.location = (0, 0)
-    object_info.location = (200, 0)
-    instance_on_points.location = (400, 0)
-    set_material.location = (600, 0)
-
-    if selected_object.active_material:
-        set_material.inputs['Material'].default_value = selected_object.active_material
-    else:
-        set_material.inputs['Material'].default_value = create_default_material()
+    set_material.location = (1100, 0)
 
     links.new(group_input.outputs['Geometry'], mesh_to_points.inputs['Mesh'])
-    links.new(mesh_to_points.outputs['Points'], instance_on_points.inputs['Points'])
-    links.new(object_info.outputs['Geometry'], instance_on_points.inputs['Instance'])
-    links.new(instance_on_points.outputs['Instances'], set_material.inputs['Geometry'])
+    links.new(build_radius_nodes(node_group, (-200, -200)), mesh_to_points.inputs['Radius'])
+
+    # Level of detail: drop the points ranked past LOD Fraction
+    lod_rank = nodes.new(type="GeometryNodeInputNamedAttribute")
+    lod_rank.data_type = 'FLOAT'
+    lod_rank.inputs['Name'].default_value = LOD_RANK_ATTRIBUTE
+    past_lod = nodes.new(type="FunctionNodeCompare")
+    past_lod.data_type = 'FLOAT'
+    past_lod.operation = 'GREATER_EQUAL'
+    delete_lod = nodes.new(type="GeometryNodeDeleteGeometry")
+    delete_lod.domain = 'POINT'
+    lod_rank.location = (0, -300)
+    past_lod.location = (150, -300)
+    delete_lod.location = (300, 0)
+    links.new(enabled_sockets(lod_rank.outputs)[0], past_lod.inputs[0])
+    links.new(group_input.outputs['LOD Fraction'], past_lod.inputs[1])
+    links.new(mesh_to_points.outputs['Points'], delete_lod.inputs['Geometry'])
+    links.new(past_lod.outputs['Result'], delete_lod.inputs['Selection'])
+
+    points = build_point_cache_nodes(node_group, delete_lod.outputs['Geometry'], (400, 300))
+    points = build_instancing_nodes(node_group, points, (500, 0))
+    links.new(points, set_material.inputs['Geometry'])
+    links.new(group_input.outputs['Material'], set_material.inputs['Material'])
     links.new(set_material.outputs['Geometry'], group_output.inputs['Geometry'])
 
-    mesh_to_points.inputs['Radius'].default_value = props.radius
+# Settings that change the baked points. Instancing, culling and viewport-only
+# settings are applied on top of the cache and do not invalidate it.
+CACHE_IGNORED_PROPERTIES = {
+    "viewport_density", "viewport_point_budget", "cull_viewport", "cull_render", "cull_margin",
+    "enable_points_add", "instance_object_add", "scale_add",
+    "enable_points_mesh", "instance_object_mesh", "scale_mesh",
+}
+
+# mesh pointer -> checksum of the vertex positions, dropped when the mesh changes
+mesh_checksum_cache = {}
+
+def get_mesh_checksum(mesh):
+    key = mesh.as_pointer()
+    checksum = mesh_checksum_cache.get(key)
+    if checksum is None:
+        positions = read_vertex_positions(mesh)
+        checksum = mesh_checksum_cache[key] = f"{len(mesh.vertices)}-{len(mesh.polygons)}-{zlib.crc32(positions.tobytes()):08x}"
+    return checksum
+
+def get_point_cache_key(selected_object):
+    props = selected_object.blender_points_props
+    settings = [(name, getattr(props, name)) for name in POINT_SETTING_PROPERTIES if name not in CACHE_IGNORED_PROPERTIES]
+    key = [props.selected_feature, get_mesh_checksum(selected_object.data), settings]
+    return hashlib.sha1(json.dumps(key).encode()).hexdigest()
+
+# object pointer -> whether the baked cache still matches the mesh and settings. The check
+# checksums the mesh, so it runs from a timer and the panel only reads the result. Object
+# updates, which include every settings change, drop the entry.
+point_cache_status = {}
+pending_point_cache_checks = set()  # names of objects waiting for a check
 
-    instance_obj = bpy.data.objects.get(props.instance_object_mesh)
-    if instance_obj:
-        object_info.inputs['Object'].default_value = instance_obj
+def get_point_cache_status(selected_object):
+    status = point_cache_status.get(selected_object.as_pointer())
+    if status is None or status["mesh_update"] != mesh_update_counters.get(selected_object.data.as_pointer(), 0):
+        pending_point_cache_checks.add(selected_object.name)
+        if not bpy.app.timers.is_registered(refresh_point_cache_status):
+            bpy.app.timers.register(refresh_point_cache_status, first_interval=0.0)
+        return None
+    return status["valid"]
 
-    instance_on_points.mute = not props.enable_points_mesh
-    instance_on_points.inputs['Scale'].default_value = (props.scale_mesh, props.scale_mesh, props.scale_mesh)
+def refresh_point_cache_status():
+    for object_name in pending_point_cache_checks:
+        selected_object = bpy.data.objects.get(object_name)
+        if selected_object is None or selected_object.type != 'MESH':
+            continue
+        point_cache_status[selected_object.as_pointer()] = {
+            "valid": selected_object.blender_points_props.point_cache_key == get_point_cache_key(selected_object),
+            "mesh_update": mesh_update_counters.get(selected_object.data.as_pointer(), 0),
+        }
+    pending_point_cache_checks.clear()
+    tag_view3d_redraw()
+    return None
+
+@persistent
+def clear_point_cache_status(dummy):
+    point_cache_status.clear()
+
+def get_point_cache_directory(selected_object):
+    directory = bpy.path.abspath(selected_object.blender_points_props.point_cache_directory)
+    return os.path.join(directory, bpy.path.clean_name(selected_object.name))
+
+def new_helper_object(name, data=None):
+    # Hidden object the templates read points from through an Object Info node
+    if data is None:
+        data = bpy.data.meshes.new(name)
+    helper_object = bpy.data.objects.new(data.name, data)
+    helper_object["blender_points_helper"] = True
+    bpy.context.scene.collection.objects.link(helper_object)
+    helper_object.hide_viewport = True
+    helper_object.hide_render = True
+    helper_object.hide_select = True
+    return helper_object
+
+def get_point_cache_object(selected_object):
+    props = selected_object.blender_points_props
+    cache_object = bpy.data.objects.get(props.point_cache_object)
+    if cache_object is None:
+        cache_object = new_helper_object(f"{selected_object.name} Point Cache")
+        props.point_cache_object = cache_object.name
+    return cache_object
+
+def sample_stable_points(selected_object):
+    # Samples the rest pose once at render density. The template moves the samples
+    # with the deformed mesh every frame instead of distributing again.
+    props = selected_object.blender_points_props
+    stable_object = bpy.data.objects.get(props.stable_points_object)
+    if stable_object is None:
+        stable_object = new_helper_object(f"{selected_object.name} Stable Points")
+        props.stable_points_object = stable_object.name
+    mesh = selected_object.data
+    count = int(get_render_density(props) * get_mesh_statistics(mesh)[0])
+    columns = sample_mesh_surface(mesh, count, props.random)
+    load_points_into_mesh(stable_object.data, columns)
+    write_point_input(selected_object, "Stable Object")
+    return len(columns["position"])
+
+def build_progressive_points(selected_object):
+    # One sample set at Maximum Density, stored in progressive order. The template
+    # keeps its first density x area points, so the Density slider never resamples.
+    props = selected_object.blender_points_props
+    progressive_object = bpy.data.objects.get(props.progressive_points_object)
+    if progressive_object is None:
+        progressive_object = new_helper_object(f"{selected_object.name} Progressive Points")
+        props.progressive_points_object = progressive_object.name
+    mesh = selected_object.data
+    count = int(props.progressive_max_density * get_mesh_statistics(mesh)[0])
+    columns = progressive_surface_samples(mesh, count, props.random)
+    load_points_into_mesh(progressive_object.data, columns)
+    progressive_object["blender_points_source"] = get_progressive_source(selected_object)
+    write_point_input(selected_object, "Progressive Object")
+    return len(columns["position"])
+
+def get_progressive_source(selected_object):
+    props = selected_object.blender_points_props
+    return f"{get_mesh_checksum(selected_object.data)}-{props.progressive_max_density}-{props.random}"
+
+def build_poisson_points(selected_object):
+    # Runs the CPU Poisson-disk sampler on the base mesh and writes the result
+    # straight into a point cloud the template picks up
+    props = selected_object.blender_points_props
+    name = f"{selected_object.name} Poisson Points"
+    try:
+        points = poisson_disk_sample_surface(
+            selected_object.data, props.poisson_min_distance, props.random, props.poisson_max_count)
+    except ValueError as error:
+        props.poisson_error = str(error)
+        raise
+    props.poisson_error = ""
+    data = new_point_cloud(name, points.ravel(), props.radius)
+    if data is None:
+        data = new_point_mesh(name, points.ravel())
+
+    poisson_object = bpy.data.objects.get(props.poisson_points_object)
+    if poisson_object is None or poisson_object.type != data.id_type:
+        poisson_object = new_helper_object(name, data)
+        props.poisson_points_object = poisson_object.name
+    else:
+        previous = poisson_object.data
+        poisson_object.data = data
+        if previous.users == 0:
+            (bpy.data.pointclouds if previous.id_type == 'POINTCLOUD' else bpy.data.meshes).remove(previous)
+    poisson_object["blender_points_source"] = get_poisson_source(selected_object)
+    write_point_input(selected_object, "Poisson Object")
+    return len(points)
+
+def get_poisson_source(selected_object):
+    props = selected_object.blender_points_props
+    return f"{get_mesh_checksum(selected_object.data)}-{props.poisson_min_distance}-{props.poisson_max_count}-{props.random}"
+
+def refresh_point_helpers(selected_object):
+    # Rebuilds the Distribute Points helpers built from another mesh or other settings
+    props = selected_object.blender_points_props
+    poisson_object = bpy.data.objects.get(props.poisson_points_object)
+    if props.distribution_method == 'POISSON' and (poisson_object is None
+                                                   or poisson_object.get("blender_points_source") != get_poisson_source(selected_object)):
+        try:
+            build_poisson_points(selected_object)
+        except ValueError:
+            tag_view3d_redraw()  # shows poisson_error
+    progressive_object = bpy.data.objects.get(props.progressive_points_object)
+    if props.use_progressive_density and (progressive_object is None
+                                          or progressive_object.get("blender_points_source") != get_progressive_source(selected_object)):
+        build_progressive_points(selected_object)
+
+class OBJECT_OT_rebuild_poisson_points(bpy.types.Operator):
+    bl_idname = "object.rebuild_poisson_points"
+    bl_label = "Rebuild Poisson Points"
+    bl_description = "Run the Poisson-disk sampler again with the current spacing, seed and maximum count"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        selected_object = context.active_object
+        if not selected_object or selected_object.type != 'MESH':
+            self.report({'ERROR'}, "No mesh object selected")
+            return {'CANCELLED'}
+        start = time.monotonic()
+        try:
+            count = build_poisson_points(selected_object)
+        except ValueError as error:
+            self.report({'ERROR'}, str(error))
+            return {'CANCELLED'}
+        self.report({'INFO'}, f"Sampled {count:,} Poisson points in {time.monotonic() - start:.2f} s")
+        return {'FINISHED'}
+
+class OBJECT_OT_rebuild_progressive_points(bpy.types.Operator):
+    bl_idname = "object.rebuild_progressive_points"
+    bl_label = "Rebuild Progressive Points"
+    bl_description = "Sample the surface again at the maximum density with the current seed"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        selected_object = context.active_object
+        if not selected_object or selected_object.type != 'MESH':
+            self.report({'ERROR'}, "No mesh object selected")
+            return {'CANCELLED'}
+        count = build_progressive_points(selected_object)
+        self.report({'INFO'}, f"Sampled {count:,} progressive points")
+        return {'FINISHED'}
+
+class OBJECT_OT_resample_stable_points(bpy.types.Operator):
+    bl_idname = "object.resample_stable_points"
+    bl_label = "Resample Stable Points"
+    bl_description = "Sample the rest pose again with the current density and seed"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        selected_object = context.active_object
+        if not selected_object or selected_object.type != 'MESH':
+            self.report({'ERROR'}, "No mesh object selected")
+            return {'CANCELLED'}
+        count = sample_stable_points(selected_object)
+        self.report({'INFO'}, f"Sampled {count:,} stable points")
+        return {'FINISHED'}
+
+def load_point_cache_frame(selected_object, frame):
+    props = selected_object.blender_points_props
+    cache_object = bpy.data.objects.get(props.point_cache_object)
+    if cache_object is None:
+        return
+    frame = min(max(frame, props.point_cache_start), props.point_cache_end)
+    directory = get_point_cache_directory(selected_object)
+    filepath = point_cache_path(directory, frame)
+    if os.path.exists(filepath):
+        load_points_into_mesh(cache_object.data, read_point_cache_frame(filepath), get_point_cache_data_types(directory))
+
+# cache directory -> attribute types from its manifest. The frames only hold NumPy types,
+# which cannot tell a quaternion from a color, so the bake records the Blender types.
+point_cache_data_types = {}
+
+def get_point_cache_data_types(directory):
+    data_types = point_cache_data_types.get(directory)
+    if data_types is None:
+        try:
+            with open(os.path.join(directory, "manifest.json")) as manifest:
+                data_types = json.load(manifest).get("data_types", {})
+        except (OSError, ValueError):
+            data_types = {}
+        point_cache_data_types[directory] = data_types
+    return data_types
+
+@persistent
+def load_point_caches(scene, depsgraph=None):
+    for selected_object in scene.objects:
+        if selected_object.type == 'MESH' and selected_object.blender_points_props.use_point_cache:
+            load_point_cache_frame(selected_object, scene.frame_current)
+
+class OBJECT_OT_bake_point_cache(bpy.types.Operator):
+    bl_idname = "object.bake_point_cache"
+    bl_label = "Bake Point Cache"
+    bl_description = "Evaluate the points over the frame range and store every frame on disk"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        selected_object = context.active_object
+        if not selected_object or selected_object.type != 'MESH':
+            self.report({'ERROR'}, "No mesh object selected")
+            return {'CANCELLED'}
+        props = selected_object.blender_points_props
+        modifier = selected_object.modifiers.get(props.points_modifier)
+        if modifier is None or modifier.node_group is None:
+            self.report({'ERROR'}, "Apply Distribute Points or Mesh to Points first")
+            return {'CANCELLED'}
+        if props.point_cache_end < props.point_cache_start:
+            self.report({'ERROR'}, "End frame is before start frame")
+            return {'CANCELLED'}
+
+        directory = get_point_cache_directory(selected_object)
+        os.makedirs(directory, exist_ok=True)
+
+        # Bake the render point set, before instancing and culling
+        set_modifier_inputs(modifier, {
+            "Use Cache": False, "Instancing": False, "Cull Viewport": False,
+            "Viewport Density": get_render_density(props), "Viewport Point Budget": 0,
+        })
+        selected_object.update_tag(refresh={'DATA'})
+        scene = context.scene
+        frame_current = scene.frame_current
+        data_types = {}
+        try:
+            for frame in range(props.point_cache_start, props.point_cache_end + 1):
+                scene.frame_set(frame)
+                columns = read_evaluated_points(context.evaluated_depsgraph_get(), selected_object, data_types)
+                if not columns:
+                    columns = {"position": np.zeros((0, 3), dtype=np.float32)}
+                write_point_cache_frame(point_cache_path(directory, frame), columns)
+        finally:
+            set_modifier_inputs(modifier, get_point_settings(selected_object, props, props.selected_feature))
+            selected_object.update_tag(refresh={'DATA'})
+            scene.frame_set(frame_current)
+
+        props.point_cache_key = get_point_cache_key(selected_object)
+        with open(os.path.join(directory, "manifest.json"), "w") as manifest:
+            json.dump({"object": selected_object.name, "key": props.point_cache_key,
+                       "frame_start": props.point_cache_start, "frame_end": props.point_cache_end,
+                       "data_types": data_types}, manifest)
+        point_cache_data_types[directory] = data_types
+        get_point_cache_object(selected_object)
+        set_modifier_inputs(modifier, {"Cache Object": bpy.data.objects.get(props.point_cache_object)})
+        selected_object.update_tag(refresh={'DATA'})
+        load_point_cache_frame(selected_object, frame_current)
+        self.report({'INFO'}, f"Baked {props.point_cache_end - props.point_cache_start + 1} frames to {directory}")
+        return {'FINISHED'}
 
 class OBJECT_OT_add_points_modifier(bpy.types.Operator):
     bl_idname = "object.add_points_modifier"
@@ -317,6 +2419,8 @@ class OBJECT_OT_add_points_modifier(bpy.types.Operator):
             enable_cycles(context)
             apply_distribute_points(context)
             selected_object.blender_points_props.selected_feature = 'ADD_POINTS'
+            if selected_object.blender_points_props.distribution_method == 'POISSON' and selected_object.blender_points_props.poisson_error:
+                self.report({'WARNING'}, selected_object.blender_points_props.poisson_error)
             return {'FINISHED'}
         else:
             self.report({'ERROR'}, "No mesh object selected")
@@ -339,6 +2443,47 @@ class OBJECT_OT_add_mesh_to_points(bpy.types.Operator):
             self.report({'ERROR'}, "No mesh object selected")
             return {'CANCELLED'}
 
+class OBJECT_OT_batch_points(bpy.types.Operator):
+    bl_idname = "object.batch_points"
+    bl_label = "Apply to Selection"
+    bl_description = "Apply the effect to every selected mesh with one shared node group"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    feature: bpy.props.EnumProperty(
+        name="Feature",
+        items=[
+            ('ADD_POINTS', "Distribute Points", "Scatter points over every selected mesh"),
+            ('MESH_TO_POINTS', "Mesh to Points", "Turn the vertices of every selected mesh into points"),
+        ],
+        default='ADD_POINTS'
+    )
+
+    def execute(self, context):
+        selected_meshes = [obj for obj in context.selected_objects if obj.type == 'MESH']
+        if not selected_meshes:
+            self.report({'ERROR'}, "No mesh objects selected")
+            return {'CANCELLED'}
+
+        # Every object starts from the active object's settings and can be tweaked afterwards
+        source_object = context.active_object if context.active_object in selected_meshes else selected_meshes[0]
+        props = source_object.blender_points_props
+
+        for obj in selected_meshes:
+            if obj != source_object:
+                copy_point_settings(props, obj.blender_points_props)
+            try:
+                assign_point_template(obj, obj.blender_points_props, self.feature)
+            except ValueError as error:
+                self.report({'WARNING'}, f"{obj.name}: {error}")
+                continue
+            if self.feature == 'ADD_POINTS' and obj.blender_points_props.distribution_method == 'POISSON' and obj.blender_points_props.poisson_error:
+                self.report({'WARNING'}, f"{obj.name}: {obj.blender_points_props.poisson_error}")
+
+        enable_cycles(context)
+        context.view_layer.update()
+        self.report({'INFO'}, f"Applied to {len(selected_meshes)} objects")
+        return {'FINISHED'}
+
 class OBJECT_OT_reset_model(bpy.types.Operator):
     bl_idname = "object.reset_model"
     bl_label = "Reset Model"
@@ -348,15 +2493,6 @@ class OBJECT_OT_reset_model(bpy.types.Operator):
     def execute(self, context):
         selected_object = context.active_object
         if selected_object and selected_object.type == 'MESH':
-            for mod in selected_object.modifiers:
-                if mod.type == 'NODES' and mod.node_group:
-                    for node in mod.node_group.nodes:
-                        if node.bl_idname == "GeometryNodeSetPointRadius":
-                            node.inputs['Radius'].default_value = 0.023
-                        if node.bl_idname == "GeometryNodeDistributePointsOnFaces":
-                            node.inputs['Density'].default_value = 25.0
-                        if node.bl_idname == "GeometryNodeMeshToPoints":
-                            node.inputs['Radius'].default_value = 0.023
             selected_object.blender_points_props.density = 25.0
             selected_object.blender_points_props.radius = 0.023
             selected_object.blender_points_props.random = 0
@@ -393,6 +2529,36 @@ class OBJECT_OT_help_button(bpy.types.Operator):
         bpy.ops.wm.url_open(url="mailto:inquiry@marv.studio")
         return {'FINISHED'}
 
+def draw_culling_and_cache(layout, context, selected_object):
+    props = selected_object.blender_points_props
+    box = layout.box()
+    box.label(text="Camera Culling", icon='CAMERA_DATA')
+    if context.scene.camera is None:
+        box.label(text="The scene has no active camera", icon='ERROR')
+    row = box.row(align=True)
+    row.prop(props, "cull_viewport", text="Viewport", toggle=True)
+    row.prop(props, "cull_render", text="Render", toggle=True)
+    box.prop(props, "cull_margin", text="Margin")
+
+    box = layout.box()
+    box.label(text="Point Cache", icon='FILE_CACHE')
+    box.prop(props, "point_cache_directory", text="")
+    row = box.row(align=True)
+    row.prop(props, "point_cache_start", text="Start")
+    row.prop(props, "point_cache_end", text="End")
+    box.operator("object.bake_point_cache", text="Bake", icon='REC')
+    if not props.point_cache_key:
+        box.label(text="Not baked")
+    else:
+        valid = get_point_cache_status(selected_object)
+        if valid is None:
+            box.label(text="Checking cache...")
+        elif valid:
+            box.label(text="Cache valid", icon='CHECKMARK')
+        else:
+            box.label(text="Cache outdated, bake again", icon='ERROR')
+    box.prop(props, "use_point_cache", text="Use Point Cache")
+
 class OBJECT_PT_blender_points_panel(bpy.types.Panel):
     bl_idname = "OBJECT_PT_blender_points_panel"
     bl_label = "Blender.Points"
@@ -419,33 +2585,96 @@ class OBJECT_PT_blender_points_panel(bpy.types.Panel):
             col.label(text="Distribute Points")
             col.operator("object.add_mesh_to_points", text="", icon='MESH_UVSPHERE')
             col.label(text="Mesh to Points")
+            if len(context.selected_objects) > 1:
+                layout.label(text="Whole Selection")
+                row = layout.row(align=True)
+                row.operator("object.batch_points", text="Distribute Points").feature = 'ADD_POINTS'
+                row.operator("object.batch_points", text="Mesh to Points").feature = 'MESH_TO_POINTS'
         else:
             if selected_object and selected_object.type == 'MESH':
                 box = layout.box()
                 box.label(text=f"Object: {selected_object.name}")
-                box.label(text=f"Polygons: {len(selected_object.data.polygons)}")
+                statistics = get_object_statistics(selected_object)
+                if statistics is None:
+                    box.label(text="Updating statistics...")
+                else:
+                    box.label(text=f"Polygons: {statistics['polygons']:,}")
+                    box.label(text=f"Vertices: {statistics['vertices']:,}")
+                    box.label(text=f"Surface Area: {statistics['surface_area']:,.2f}")
+                    box.label(text=f"Evaluated Points: {statistics['evaluated_points']:,}")
+                    box.label(text=f"Evaluated Instances: {statistics['instances']:,}")
+
+                    render_points, viewport_points, instances, memory = estimate_point_cost(selected_object, statistics)
+                    box = layout.box()
+                    box.label(text="Estimate", icon='INFO')
+                    box.label(text=f"Points: {render_points:,} render / {viewport_points:,} viewport")
+                    box.label(text=f"Instances: {instances:,}")
+                    box.label(text=f"Memory: ~{memory / (1024 * 1024):,.1f} MB")
+                    if memory > selected_object.blender_points_props.memory_warning_mb * 1024 * 1024:
+                        box.label(text="Estimated memory is above the warning limit", icon='ERROR')
+                    box.prop(selected_object.blender_points_props, "memory_warning_mb", text="Warn Above (MB)")
 
             if selected_object.blender_points_props.selected_feature == 'ADD_POINTS':
                 layout.label(text="Step 2: Point Settings")
-                layout.prop(selected_object.blender_points_props, "density", text="Density")
+                layout.prop(selected_object.blender_points_props, "distribution_method", text="Distribution")
+                if selected_object.blender_points_props.distribution_method == 'POISSON':
+                    box = layout.box()
+                    box.prop(selected_object.blender_points_props, "poisson_min_distance", text="Minimum Distance")
+                    box.prop(selected_object.blender_points_props, "poisson_max_count", text="Maximum Count")
+                    box.operator("object.rebuild_poisson_points", text="Rebuild Poisson Points", icon='FILE_REFRESH')
+                    if selected_object.blender_points_props.poisson_error:
+                        box.label(text=selected_object.blender_points_props.poisson_error, icon='ERROR')
+                layout.prop(selected_object.blender_points_props, "density_mode", text="Mode")
+                if selected_object.blender_points_props.density_mode == 'POINT_COUNT':
+                    layout.prop(selected_object.blender_points_props, "target_point_count", text="Target Point Count")
+                    layout.label(text=f"Render Density: {get_render_density(selected_object.blender_points_props):.3f}")
+                else:
+                    layout.prop(selected_object.blender_points_props, "density", text="Render Density")
+                layout.prop(selected_object.blender_points_props, "viewport_density", text="Viewport Density")
+                layout.prop(selected_object.blender_points_props, "viewport_point_budget", text="Viewport Point Budget")
+                layout.prop(selected_object.blender_points_props, "use_camera_falloff", text="Camera Distance Falloff")
+                if selected_object.blender_points_props.use_camera_falloff:
+                    box = layout.box()
+                    if context.scene.camera is None:
+                        box.label(text="The scene has no active camera", icon='ERROR')
+                    box.prop(selected_object.blender_points_props, "camera_near", text="Near Distance")
+                    box.prop(selected_object.blender_points_props, "camera_far", text="Far Distance")
+                    box.prop(selected_object.blender_points_props, "camera_min_density", text="Minimum Density")
                 layout.prop(selected_object.blender_points_props, "radius", text="Point Size")
                 layout.prop(selected_object.blender_points_props, "random", text="Random Seed")
+                row = layout.row(align=True)
+                row.prop(selected_object.blender_points_props, "use_progressive_density", text="Progressive Density")
+                if selected_object.blender_points_props.use_progressive_density:
+                    row.prop(selected_object.blender_points_props, "progressive_max_density", text="Max")
+                    row.operator("object.rebuild_progressive_points", text="", icon='FILE_REFRESH')
+                row = layout.row(align=True)
+                row.prop(selected_object.blender_points_props, "use_stable_points", text="Stable Points")
+                if selected_object.blender_points_props.use_stable_points:
+                    row.operator("object.resample_stable_points", text="", icon='FILE_REFRESH')
                 layout.prop(selected_object.blender_points_props, "enable_points_add", text="Enable Points Instancing")
                 if selected_object.blender_points_props.enable_points_add:
                     box = layout.box()
                     box.label(text="Instance Settings", icon='MODIFIER')
                     box.prop(selected_object.blender_points_props, "instance_object_add", text="Select your object to replace the points")
                     box.prop(selected_object.blender_points_props, "scale_add", text="Scale")
+                draw_culling_and_cache(layout, context, selected_object)
                 layout.operator("object.reset_model", text="Reset", icon='FILE_REFRESH')
             elif selected_object.blender_points_props.selected_feature == 'MESH_TO_POINTS':
                 layout.label(text="Step 2: Point Settings")
-                layout.prop(selected_object.blender_points_props, "radius", text="Point Size")
+                layout.prop(selected_object.blender_points_props, "radius_mode", text="Radius")
+                if selected_object.blender_points_props.radius_mode == 'ADAPTIVE':
+                    layout.prop(selected_object.blender_points_props, "radius_factor", text="Radius Factor")
+                    layout.prop(selected_object.blender_points_props, "radius_neighbors", text="Neighbours")
+                else:
+                    layout.prop(selected_object.blender_points_props, "radius", text="Point Size")
+                layout.prop(selected_object.blender_points_props, "lod_level", text="Level of Detail")
                 layout.prop(selected_object.blender_points_props, "enable_points_mesh", text="Enable Points Instancing", icon='TOOL_SETTINGS')
                 if selected_object.blender_points_props.enable_points_mesh:
                     box = layout.box()
                     box.label(text="Instance Settings", icon='MODIFIER')
                     box.prop(selected_object.blender_points_props, "instance_object_mesh", text="Select your object to replace the points")
                     box.prop(selected_object.blender_points_props, "scale_mesh", text="Scale")
+                draw_culling_and_cache(layout, context, selected_object)
 
             layout.separator()
             row = layout.row()
@@ -488,6 +2717,11 @@ classes = (
     BlenderPointsProperties,
     OBJECT_OT_add_points_modifier,
     OBJECT_OT_add_mesh_to_points,
+    OBJECT_OT_batch_points,
+    OBJECT_OT_bake_point_cache,
+    OBJECT_OT_resample_stable_points,
+    OBJECT_OT_rebuild_progressive_points,
+    OBJECT_OT_rebuild_poisson_points,
     OBJECT_OT_reset_model,
     OBJECT_OT_return_to_main,
     OBJECT_OT_help_button,
@@ -500,14 +2734,51 @@ def register():
     bpy.types.Object.blender_points_props = bpy.props.PointerProperty(type=BlenderPointsProperties)
     bpy.types.Scene.blender_points_props = bpy.props.PointerProperty(type=BlenderPointsProperties)
     bpy.app.handlers.load_post.append(load_persistent_data)
+    bpy.app.handlers.depsgraph_update_post.append(update_mesh_caches)
+    bpy.app.handlers.depsgraph_update_post.append(update_camera_frustums)
+    bpy.app.handlers.depsgraph_update_post.append(update_instance_object_items)
+    bpy.app.handlers.load_post.append(clear_instance_object_items)
+    bpy.app.handlers.undo_post.append(clear_instance_object_items)
+    bpy.app.handlers.redo_post.append(clear_instance_object_items)
+    bpy.app.handlers.load_post.append(clear_mesh_caches)
+    bpy.app.handlers.load_post.append(clear_point_cache_status)
+    bpy.app.handlers.undo_post.append(clear_mesh_caches)
+    bpy.app.handlers.undo_post.append(clear_point_cache_status)
+    bpy.app.handlers.redo_post.append(clear_mesh_caches)
+    bpy.app.handlers.redo_post.append(clear_point_cache_status)
+    bpy.app.handlers.frame_change_pre.append(load_point_caches)
     print("Blender.Points plugin registered")
 
 def unregister():
+    if bpy.app.timers.is_registered(flush_point_inputs):
+        bpy.app.timers.unregister(flush_point_inputs)
+    if bpy.app.timers.is_registered(refresh_object_statistics):
+        bpy.app.timers.unregister(refresh_object_statistics)
+    if bpy.app.timers.is_registered(flush_mesh_attributes):
+        bpy.app.timers.unregister(flush_mesh_attributes)
+    if bpy.app.timers.is_registered(refresh_point_cache_status):
+        bpy.app.timers.unregister(refresh_point_cache_status)
+    pending_point_inputs.clear()
+    pending_mesh_attributes.clear()
+    pending_point_cache_checks.clear()
     for cls in classes:
         bpy.utils.unregister_class(cls)
     del bpy.types.Object.blender_points_props
     del bpy.types.Scene.blender_points_props
     bpy.app.handlers.load_post.remove(load_persistent_data)
+    bpy.app.handlers.depsgraph_update_post.remove(update_mesh_caches)
+    bpy.app.handlers.depsgraph_update_post.remove(update_camera_frustums)
+    bpy.app.handlers.depsgraph_update_post.remove(update_instance_object_items)
+    bpy.app.handlers.load_post.remove(clear_instance_object_items)
+    bpy.app.handlers.undo_post.remove(clear_instance_object_items)
+    bpy.app.handlers.redo_post.remove(clear_instance_object_items)
+    bpy.app.handlers.load_post.remove(clear_mesh_caches)
+    bpy.app.handlers.load_post.remove(clear_point_cache_status)
+    bpy.app.handlers.undo_post.remove(clear_mesh_caches)
+    bpy.app.handlers.undo_post.remove(clear_point_cache_status)
+    bpy.app.handlers.redo_post.remove(clear_mesh_caches)
+    bpy.app.handlers.redo_post.remove(clear_point_cache_status)
+    bpy.app.handlers.frame_change_pre.remove(load_point_caches)
     print("Blender.Points plugin unregistered")
 
 if __name__ == "__main__":
@@ -0,0 +1,57 @@
+# Compares the built-in PLY exporter with write_ply from the simple converter add-on.
+# Run inside Blender: blender -b --factory-startup -P benchmark_ply_export.py -- 5000000
+
+import importlib.util
+import os
+import sys
+import tempfile
+import time
+
+import bpy
+import numpy as np
+
+# The add-on file name has spaces, so load it by path. It only registers when run as __main__.
+CONVERTER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "v1 simple converter.py")
+spec = importlib.util.spec_from_file_location("simple_converter", CONVERTER_PATH)
+converter = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(converter)
+
+def make_point_mesh(count):
+    rng = np.random.default_rng(0)
+    co = rng.random(count * 3, dtype=np.float32)
+    mesh = converter.new_point_mesh("BenchmarkPoints", co)
+    radius = mesh.attributes.new("radius", 'FLOAT', 'POINT')
+    radius.data.foreach_set("value", np.full(count, 0.023, dtype=np.float32))
+    obj = bpy.data.objects.new("BenchmarkPoints", mesh)
+    bpy.context.scene.collection.objects.link(obj)
+    bpy.context.view_layer.objects.active = obj
+    obj.select_set(True)
+    return obj
+
+def builtin_export(filepath):
+    if hasattr(bpy.ops.wm, "ply_export"):
+        bpy.ops.wm.ply_export(filepath=filepath, export_selected_objects=True, ascii_format=False)
+    else:
+        bpy.ops.export_mesh.ply(filepath=filepath, use_selection=True, use_mesh_modifiers=False)
+
+def engine_export(filepath):
+    obj = bpy.context.active_object
+    columns = converter.read_evaluated_points(bpy.context.evaluated_depsgraph_get(), obj)
+    converter.write_ply(filepath, columns)
+
+def timed(label, export, filepath):
+    start = time.perf_counter()
+    export(filepath)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<12} {elapsed:8.3f} s  {os.path.getsize(filepath) / (1024 * 1024):10.1f} MB")
+
+def main():
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    count = int(argv[0]) if argv else 1000000
+    make_point_mesh(count)
+    print(f"Exporting {count:,} points")
+    with tempfile.TemporaryDirectory() as directory:
+        timed("built-in", builtin_export, os.path.join(directory, "builtin.ply"))
+        timed("write_ply", engine_export, os.path.join(directory, "engine.ply"))
+
+main()
@@ -1,5 +1,5 @@
 import bpy
-import bmesh
+import numpy as np
 
 bl_info = {
     "name": "Easy Points",
@@ -16,6 +16,20 @@ bl_info = {
     "doc_url": "",
 }
 
+# NumPy helpers: geometry moves through flat float32 buffers with foreach_get/foreach_set
+# instead of a Python object per vertex
+def read_vertex_positions(mesh):
+    co = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", co)
+    return co
+
+def new_point_mesh(name, co):
+    point_cloud_mesh = bpy.data.meshes.new(name=name)
+    point_cloud_mesh.vertices.add(len(co) // 3)
+    point_cloud_mesh.vertices.foreach_set("co", co)
+    point_cloud_mesh.update()
+    return point_cloud_mesh
+
 selected_feature = None
 
 class EasyPointsProperties(bpy.types.PropertyGroup):
@@ -140,21 +154,10 @@ def apply_mesh_to_points(context):
     selected_object = context.active_object
     props = context.scene.easy_points_props
 
-    mesh = selected_object.data
-    bm = bmesh.new()
-    bm.from_mesh(mesh)
-    bm.verts.ensure_lookup_table()
-
-    points = [v.co.copy() for v in bm.verts]
-    bm.clear()
-
-    point_cloud_mesh = bpy.data.meshes.new(name="PointCloud")
+    point_cloud_mesh = new_point_mesh("PointCloud", read_vertex_positions(selected_object.data))
     point_cloud_obj = bpy.data.objects.new(name="PointCloud", object_data=point_cloud_mesh)
     context.collection.objects.link(point_cloud_obj)
 
-    point_cloud_mesh.from_pydata(points, [], [])
-    point_cloud_mesh.update()
-
     bpy.data.objects.remove(selected_object)
     selected_object = point_cloud_obj
 
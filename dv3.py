@@ -1,5 +1,8 @@
 import bpy
-import bmesh
+
+import sys
+import tempfile
+import numpy as np
 
 bl_info = {
     "name": "Easy Points",
@@ -16,6 +19,185 @@ bl_info = {
     "doc_url": "",
 }
 
+# NumPy helpers: geometry moves through flat float32 buffers with foreach_get/foreach_set
+# instead of a Python object per vertex
+STREAM_CHUNK_SIZE = 1 << 20
+
+def new_buffer(length, dtype=np.float32, memory_limit=None):
+    # Buffers larger than memory_limit are backed by a temporary file, so the
+    # OS pages them in and out while Blender walks them instead of keeping the
+    # whole array resident.
+    dtype = np.dtype(dtype)
+    if memory_limit is None or length * dtype.itemsize <= memory_limit:
+        return np.empty(length, dtype=dtype)
+    return np.memmap(tempfile.TemporaryFile(), dtype=dtype, mode="w+", shape=(length,))
+
+def fill_buffer(buffer, value, chunk_size=STREAM_CHUNK_SIZE):
+    for start in range(0, len(buffer), chunk_size):
+        buffer[start:start + chunk_size] = value
+    if isinstance(buffer, np.memmap):
+        buffer.flush()
+    return buffer
+
+def peak_rss_bytes():
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+def read_vertex_positions(mesh, memory_limit=None):
+    co = new_buffer(len(mesh.vertices) * 3, memory_limit=memory_limit)
+    mesh.vertices.foreach_get("co", co)
+    return co
+
+def new_point_mesh(name, co):
+    point_cloud_mesh = bpy.data.meshes.new(name=name)
+    point_cloud_mesh.vertices.add(len(co) // 3)
+    point_cloud_mesh.vertices.foreach_set("co", co)
+    point_cloud_mesh.update()
+    return point_cloud_mesh
+
+def new_point_cloud(name, co, radius, memory_limit=None):
+    # Returns None when this Blender build cannot size a PointCloud from Python.
+    if not hasattr(bpy.data, "pointclouds"):
+        return None
+    point_cloud = bpy.data.pointclouds.new(name=name)
+    if not hasattr(point_cloud, "resize"):
+        bpy.data.pointclouds.remove(point_cloud)
+        return None
+
+    count = len(co) // 3
+    point_cloud.resize(count)
+    point_cloud.attributes["position"].data.foreach_set("vector", co)
+
+    if np.ndim(radius) == 0:
+        radius = fill_buffer(new_buffer(count, memory_limit=memory_limit), radius)
+    write_point_attribute(point_cloud, "radius", radius)
+    point_cloud.update_tag()
+    return point_cloud
+
+def point_data_type(values):
+    # The attribute type a column is written as when its source type is not known
+    width = 1 if values.ndim == 1 else values.shape[1]
+    if values.dtype.kind == "b":
+        return 'BOOLEAN' if width == 1 else None
+    if values.dtype.kind in "iu":
+        return {1: 'INT8' if values.dtype == np.int8 else 'INT', 2: 'INT32_2D'}.get(width)
+    return {1: 'FLOAT', 2: 'FLOAT2', 3: 'FLOAT_VECTOR', 4: 'FLOAT_COLOR'}.get(width)
+
+def write_point_attribute(data, name, values, data_type=None):
+    # Columns whose type cannot be told from the values or whose width does not
+    # match the type are skipped
+    if data_type is None:
+        data_type = point_data_type(values)
+    if data_type in ATTRIBUTE_WIDTHS:
+        (width, key), dtype = ATTRIBUTE_WIDTHS[data_type], np.float32
+    elif data_type in OTHER_ATTRIBUTE_TYPES:
+        width, key, dtype = OTHER_ATTRIBUTE_TYPES[data_type]
+    else:
+        return None
+    if (1 if values.ndim == 1 else values.shape[1]) != width:
+        return None
+    attribute = data.attributes.get(name)
+    if attribute is not None and attribute.data_type != data_type:
+        data.attributes.remove(attribute)
+        attribute = None
+    if attribute is None:
+        attribute = data.attributes.new(name, data_type, 'POINT')
+    attribute.data.foreach_set(key, np.ascontiguousarray(values, dtype=dtype).ravel())
+    return attribute
+
+def voxel_keys(points, voxel_size):
+    # One hashable key per point: its voxel cell, or its exact coordinates when voxel_size is 0.
+    if len(points) == 0:
+        return np.zeros(0, dtype=np.int64)
+    if voxel_size <= 0.0:
+        cells = np.ascontiguousarray(points).view(np.int32)
+    else:
+        cells = np.floor((points - points.min(axis=0)) / voxel_size).astype(np.int64)
+        dims = cells.max(axis=0) + 1
+        if float(dims[0]) * float(dims[1]) * float(dims[2]) < 2 ** 62:
+            return np.ravel_multi_index(cells.T, dims)
+    return np.ascontiguousarray(cells).view(np.dtype((np.void, cells.dtype.itemsize * 3))).ravel()
+
+def voxel_downsample(points, voxel_size, mode='FIRST', attributes=None):
+    # Collapses the points that share a voxel into one. 'FIRST' keeps the first point
+    # and its attributes, 'CENTROID' averages positions and attributes per voxel.
+    attributes = attributes or {}
+    _, first_index, inverse = np.unique(voxel_keys(points, voxel_size), return_index=True, return_inverse=True)
+    inverse = inverse.ravel()
+    if mode == 'FIRST':
+        order = np.sort(first_index)
+        return points[order], {name: values[order] for name, values in attributes.items()}
+
+    # Number the voxels in order of their first point so the output keeps the input order
+    rank = np.empty(len(first_index), dtype=np.int64)
+    rank[np.argsort(first_index)] = np.arange(len(first_index))
+    inverse = rank[inverse]
+    counts = np.bincount(inverse).astype(np.float64)
+
+    def average(values):
+        columns = values.reshape(len(values), int(np.prod(values.shape[1:])))
+        means = [np.bincount(inverse, weights=columns[:, index]) / counts for index in range(columns.shape[1])]
+        return np.column_stack(means).astype(np.float32).reshape((len(counts),) + values.shape[1:])
+
+    return average(points), {name: average(values) for name, values in attributes.items()}
+
+def mesh_to_point_object(context, source_object, name="PointCloud", output_type='MESH', radius=0.023, memory_limit=None, voxel_size=None, voxel_mode='FIRST'):
+    attributes, data_types = {}, {}
+    if voxel_size is None:
+        co = read_vertex_positions(source_object.data, memory_limit)
+    else:
+        attributes = read_point_attributes(source_object.data, data_types)
+        points, attributes = voxel_downsample(attributes.pop("position"), voxel_size, voxel_mode, attributes)
+        co = points.ravel()
+
+    point_data = None
+    if output_type == 'POINTCLOUD':
+        point_data = new_point_cloud(name, co, radius, memory_limit)
+    if point_data is None:
+        point_data = new_point_mesh(name, co)
+    for attribute_name, values in attributes.items():
+        write_point_attribute(point_data, attribute_name, values, data_types.get(attribute_name))
+    point_cloud_obj = bpy.data.objects.new(name=name, object_data=point_data)
+    context.collection.objects.link(point_cloud_obj)
+    return point_cloud_obj
+
+ATTRIBUTE_WIDTHS = {'FLOAT': (1, "value"), 'FLOAT2': (2, "vector"), 'FLOAT_VECTOR': (3, "vector"), 'FLOAT_COLOR': (4, "color")}
+
+# (width, key, NumPy type) of the other attribute types that are read as point columns.
+# Byte colors are read as float colors; strings and matrices are not read.
+OTHER_ATTRIBUTE_TYPES = {
+    'INT': (1, "value", np.int32), 'INT8': (1, "value", np.int8), 'BOOLEAN': (1, "value", bool),
+    'INT32_2D': (2, "value", np.int32), 'BYTE_COLOR': (4, "color", np.float32), 'QUATERNION': (4, "value", np.float32),
+}
+
+def read_point_attributes(data, data_types=None):
+    # data_types, when given, receives the Blender type of every column read
+    count = len(data.points) if hasattr(data, "points") else len(data.vertices)
+    columns = {}
+    for attribute in data.attributes:
+        if attribute.domain != 'POINT' or attribute.name.startswith("."):
+            continue
+        if attribute.data_type in ATTRIBUTE_WIDTHS:
+            width, key = ATTRIBUTE_WIDTHS[attribute.data_type]
+            dtype = np.float32
+        elif attribute.data_type in OTHER_ATTRIBUTE_TYPES:
+            width, key, dtype = OTHER_ATTRIBUTE_TYPES[attribute.data_type]
+        else:
+            continue
+        values = np.empty(count * width, dtype=dtype)
+        attribute.data.foreach_get(key, values)
+        columns[attribute.name] = values.reshape(count, width) if width > 1 else values
+        if data_types is not None:
+            data_types[attribute.name] = attribute.data_type
+    if "position" not in columns and hasattr(data, "vertices"):
+        columns["position"] = read_vertex_positions(data).reshape(-1, 3)
+    return columns
+
 selected_feature = None
 
 def update_geometry_node(self, context):
@@ -101,6 +283,42 @@ class EasyPointsProperties(bpy.types.PropertyGroup):
         max=10.0,
         update=update_geometry_node
     )
+    use_disk_staging: bpy.props.BoolProperty(
+        name="Stage on Disk",
+        description="Keep the vertex positions copied out of the mesh (12 bytes per vertex) in a temporary file when they exceed the staging limit. "
+                    "Only that copy leaves RAM, the source and output meshes stay in memory",
+        default=False
+    )
+    staging_limit: bpy.props.IntProperty(
+        name="Staging Limit (MB)",
+        description="Largest vertex staging buffer kept in RAM before it is moved to a temporary file",
+        default=2048,
+        min=64,
+        max=1048576
+    )
+    use_downsampling: bpy.props.BoolProperty(
+        name="Remove Duplicates",
+        description="Merge coincident points, or all points sharing a voxel, before the points are created",
+        default=False
+    )
+    voxel_size: bpy.props.FloatProperty(
+        name="Voxel Size",
+        description="Edge length of the merge grid. 0 only removes exact duplicates",
+        default=0.0,
+        min=0.0,
+        max=100.0,
+        precision=4,
+        unit='LENGTH'
+    )
+    voxel_mode: bpy.props.EnumProperty(
+        name="Voxel Mode",
+        description="Which point represents a voxel",
+        items=[
+            ('FIRST', "Keep First", "Keep the first point in each voxel and its attributes"),
+            ('CENTROID', "Centroid", "Average the positions and attributes of the points in each voxel"),
+        ],
+        default='FIRST'
+    )
     applied_effect: bpy.props.StringProperty(
         name="Applied Effect",
         description="Stores the applied effect type",
@@ -177,23 +395,27 @@ def apply_mesh_to_points(context):
     selected_object = context.active_object
     props = selected_object.easy_points_props
 
-    mesh = selected_object.data
-    bm = bmesh.new()
-    bm.from_mesh(mesh)
-    bm.verts.ensure_lookup_table()
-
-    points = [v.co.copy() for v in bm.verts]
-    bm.clear()
-
-    point_cloud_mesh = bpy.data.meshes.new(name="PointCloud")
-    point_cloud_obj = bpy.data.objects.new(name="PointCloud", object_data=point_cloud_mesh)
-    context.collection.objects.link(point_cloud_obj)
-
-    point_cloud_mesh.from_pydata(points, [], [])
-    point_cloud_mesh.update()
+    memory_limit = props.staging_limit * 1024 * 1024 if props.use_disk_staging else None
+    voxel_size = props.voxel_size if props.use_downsampling else None
+    source_count = len(selected_object.data.vertices)
+    # Only the float32 position buffer is staged, and only when it is over the limit
+    staged_bytes = source_count * 12
+    if memory_limit is None or voxel_size is not None or staged_bytes <= memory_limit:
+        staged_bytes = 0
+    point_cloud_obj = mesh_to_point_object(context, selected_object, memory_limit=memory_limit,
+                                                         voxel_size=voxel_size, voxel_mode=props.voxel_mode)
+    removed = source_count - len(point_cloud_obj.data.vertices)
+
+    # Carry the user's settings over to the new object. The instance object is an
+    # enum whose items change once the source is removed, so it is set by name below.
+    instance_object = props.instance_object
+    for key in props.keys():
+        if key != "instance_object":
+            point_cloud_obj.easy_points_props[key] = props[key]
 
     bpy.data.objects.remove(selected_object)
     selected_object = point_cloud_obj
+    props = selected_object.easy_points_props
 
     existing_modifier = None
     for mod in selected_object.modifiers:
@@ -215,7 +437,7 @@ def apply_mesh_to_points(context):
         node_group = modifier.node_group
 
     if node_group is None:
-        return
+        return removed, staged_bytes
 
     nodes = node_group.nodes
     links = node_group.links
@@ -241,14 +463,17 @@ def apply_mesh_to_points(context):
 
     mesh_to_points.inputs['Radius'].default_value = props.radius
 
-    instance_obj = bpy.data.objects.get(props.instance_object)
+    instance_obj = bpy.data.objects.get(instance_object)
     if instance_obj:
         object_info.inputs['Object'].default_value = instance_obj
+        props.instance_object = instance_object
 
     instance_on_points.mute = not props.enable_points
 
     props.applied_effect = "MESH_TO_POINTS"
 
+    return removed, staged_bytes
+
 class OBJECT_OT_add_points_modifier(bpy.types.Operator):
     bl_idname = "object.add_points_modifier"
     bl_label = "Distribute Points"
@@ -278,7 +503,16 @@ class OBJECT_OT_add_mesh_to_points(bpy.types.Operator):
         selected_object = context.active_object
         if selected_object and selected_object.type == 'MESH':
             enable_cycles(context)
-            apply_mesh_to_points(context)
+            use_downsampling = selected_object.easy_points_props.use_downsampling
+            use_disk_staging = selected_object.easy_points_props.use_disk_staging
+            removed, staged_bytes = apply_mesh_to_points(context)
+            if use_downsampling:
+                self.report({'INFO'}, f"Removed {removed} duplicate points")
+            if staged_bytes:
+                self.report({'INFO'}, f"Staged {staged_bytes / (1024 * 1024):.0f} MB of vertex data on disk")
+            peak_rss = peak_rss_bytes()
+            if use_disk_staging and peak_rss is not None:
+                self.report({'INFO'}, f"Conversion finished, peak memory {peak_rss / (1024 * 1024):.0f} MB")
             selected_feature = 'MESH_TO_POINTS'
             return {'FINISHED'}
         else:
@@ -346,6 +580,14 @@ class OBJECT_PT_easy_points_panel(bpy.types.Panel):
             col.label(text="Distribute Points")
             col.operator("object.add_mesh_to_points", text="", icon='OUTLINER_OB_POINTCLOUD')
             col.label(text="Mesh to Points")
+            if selected_object and selected_object.type == 'MESH':
+                col.prop(selected_object.easy_points_props, "use_disk_staging", text="Stage on Disk")
+                if selected_object.easy_points_props.use_disk_staging:
+                    col.prop(selected_object.easy_points_props, "staging_limit", text="Staging Limit (MB)")
+                col.prop(selected_object.easy_points_props, "use_downsampling", text="Remove Duplicates")
+                if selected_object.easy_points_props.use_downsampling:
+                    col.prop(selected_object.easy_points_props, "voxel_size", text="Voxel Size")
+                    col.prop(selected_object.easy_points_props, "voxel_mode", text="")
         else:
             if selected_object and selected_object.type == 'MESH':
                 box = layout.box()
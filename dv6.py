@@ -22,23 +22,9 @@ def update_geometry_node(self, context):
     selected_object = context.active_object
     if selected_object and selected_object.type == 'MESH':
         for mod in selected_object.modifiers:
-            if mod.type == 'NODES' and mod.node_group:
-                node_group = mod.node_group
-                for node in node_group.nodes:
-                    if node.bl_idname == "GeometryNodeSetPointRadius":
-                        node.inputs['Radius'].default_value = self.radius
-                    if node.bl_idname == "GeometryNodeDistributePointsOnFaces":
-                        node.inputs['Density'].default_value = self.density
-                        node.inputs['Seed'].default_value = self.random
-                    if node.bl_idname == "GeometryNodeMeshToPoints":
-                        node.inputs['Radius'].default_value = self.radius
-                    if node.bl_idname == "GeometryNodeInstanceOnPoints":
-                        node.mute = not self.enable_points
-                        node.inputs['Scale'].default_value = (self.scale, self.scale, self.scale)
-                    if node.bl_idname == "GeometryNodeObjectInfo":
-                        instance_obj = bpy.data.objects.get(self.instance_object)
-                        if instance_obj:
-                            node.inputs['Object'].default_value = instance_obj
+            if is_points_modifier(mod):
+                set_modifier_inputs(mod, get_point_settings(selected_object, self))
+        selected_object.update_tag(refresh={'DATA'})
 
 def get_instance_object_items(self, context):
     items = [("None", "Nothing Selected", "")]
@@ -110,116 +96,173 @@ def enable_cycles(context):
     context.scene.render.engine = 'CYCLES'
     context.scene.cycles.device = 'GPU'
 
-def apply_distribute_points(context):
-    selected_object = context.active_object
-    props = selected_object.easy_points_props
-
-    existing_modifier = None
+NODE_GROUP_VERSION = 1
+DISTRIBUTE_POINTS_GROUP = "Easy Points Distribute Points"
+MESH_TO_POINTS_GROUP = "Easy Points Mesh to Points"
+
+def new_geometry_node_group(name):
+    node_group = bpy.data.node_groups.new(name, 'GeometryNodeTree')
+    new_group_socket(node_group, "Geometry", 'NodeSocketGeometry')
+    new_group_socket(node_group, "Geometry", 'NodeSocketGeometry', in_out='OUTPUT')
+
+    group_input = node_group.nodes.new('NodeGroupInput')
+    group_output = node_group.nodes.new('NodeGroupOutput')
+    group_input.location = (-300, 0)
+    group_output.location = (1300, 0)
+    return node_group
+
+def new_group_socket(node_group, name, socket_type, in_out='INPUT'):
+    if hasattr(node_group, "interface"):
+        return node_group.interface.new_socket(name, in_out=in_out, socket_type=socket_type)
+    sockets = node_group.inputs if in_out == 'INPUT' else node_group.outputs
+    return sockets.new(socket_type, name)
+
+def get_group_input_identifiers(node_group):
+    if hasattr(node_group, "interface"):
+        return {item.name: item.identifier for item in node_group.interface.items_tree
+                if item.item_type == 'SOCKET' and item.in_out == 'INPUT'}
+    return {socket.name: socket.identifier for socket in node_group.inputs}
+
+def enabled_sockets(sockets):
+    return [socket for socket in sockets if socket.enabled]
+
+def get_node_group_template(name, build_nodes):
+    node_group = bpy.data.node_groups.get(name)
+    if node_group is not None and node_group.get("easy_points_version") == NODE_GROUP_VERSION:
+        return node_group
+
+    template = new_geometry_node_group(name)
+    build_nodes(template)
+    template["easy_points_version"] = NODE_GROUP_VERSION
+
+    # Move modifiers still using an outdated template over to the rebuilt one
+    if node_group is not None:
+        node_group.user_remap(template)
+        bpy.data.node_groups.remove(node_group)
+        template.name = name
+    return template
+
+def get_nodes_modifier(selected_object):
     for mod in selected_object.modifiers:
         if mod.type == 'NODES':
-            existing_modifier = mod
-            break
-
-    if existing_modifier is None:
-        bpy.ops.object.modifier_add(type='NODES')
-        modifier = selected_object.modifiers[-1]
+            return mod
+    return selected_object.modifiers.new(name="GeometryNodes", type='NODES')
+
+def get_point_settings(selected_object, props):
+    return {
+        "Density": props.density,
+        "Seed": props.random,
+        "Radius": props.radius,
+        "Instancing": props.enable_points,
+        "Instance Object": bpy.data.objects.get(props.instance_object),
+        "Scale": props.scale,
+        "Material": selected_object.active_material or create_default_material(),
+    }
+
+def set_modifier_inputs(modifier, values):
+    identifiers = get_group_input_identifiers(modifier.node_group)
+    for name, value in values.items():
+        identifier = identifiers.get(name)
+        if identifier is not None and value is not None:
+            modifier[identifier] = value
+
+def is_points_modifier(mod):
+    return mod.type == 'NODES' and mod.node_group is not None and mod.node_group.name in (DISTRIBUTE_POINTS_GROUP, MESH_TO_POINTS_GROUP)
+
+def assign_point_template(selected_object, props, feature):
+    if feature == 'ADD_POINTS':
+        node_group = get_node_group_template(DISTRIBUTE_POINTS_GROUP, build_distribute_points_nodes)
     else:
-        modifier = existing_modifier
+        node_group = get_node_group_template(MESH_TO_POINTS_GROUP, build_mesh_to_points_nodes)
 
-    if modifier.node_group is None:
-        bpy.ops.node.new_geometry_node_group_assign()
-        node_group = modifier.node_group
-    else:
-        node_group = modifier.node_group
+    modifier = get_nodes_modifier(selected_object)
+    modifier.node_group = node_group
+    set_modifier_inputs(modifier, get_point_settings(selected_object, props))
+    props.applied_effect = feature
+    selected_object.update_tag(refresh={'DATA'})
+    return modifier
 
-    if node_group is None:
-        return
+def apply_distribute_points(context):
+    selected_object = context.active_object
+    assign_point_template(selected_object, selected_object.easy_points_props, 'ADD_POINTS')
+    context.area.tag_redraw()
 
+def build_distribute_points_nodes(node_group):
     nodes = node_group.nodes
     links = node_group.links
 
-    group_input = nodes.get('Group Input') or nodes.new('NodeGroupInput')
-    group_output = nodes.get('Group Output') or nodes.new('NodeGroupOutput')
+    new_group_socket(node_group, "Density", 'NodeSocketFloat')
+    new_group_socket(node_group, "Seed", 'NodeSocketInt')
+    new_group_socket(node_group, "Radius", 'NodeSocketFloat')
+    new_group_socket(node_group, "Material", 'NodeSocketMaterial')
+
+    group_input = nodes['Group Input']
+    group_output = nodes['Group Output']
 
     distribute_points = nodes.new(type="GeometryNodeDistributePointsOnFaces")
     set_point_radius = nodes.new(type="GeometryNodeSetPointRadius")
     set_material = nodes.new(type="GeometryNodeSetMaterial")
 
-    if selected_object.active_material:
-        set_material.inputs['Material'].default_value = selected_object.active_material
-    else:
-        default_material = bpy.data.materials.get("Material") or bpy.data.materials.new(name="Material")
-        set_material.inputs['Material'].default_value = default_material
+    distribute_points.location = (0, 0)
+    set_point_radius.location = (300, 0)
+    set_material.location = (1100, 0)
 
     links.new(group_input.outputs['Geometry'], distribute_points.inputs['Mesh'])
+    links.new(group_input.outputs['Density'], distribute_points.inputs['Density'])
+    links.new(group_input.outputs['Seed'], distribute_points.inputs['Seed'])
     links.new(distribute_points.outputs['Points'], set_point_radius.inputs['Points'])
+    links.new(group_input.outputs['Radius'], set_point_radius.inputs['Radius'])
     links.new(set_point_radius.outputs['Points'], set_material.inputs['Geometry'])
+    links.new(group_input.outputs['Material'], set_material.inputs['Material'])
     links.new(set_material.outputs['Geometry'], group_output.inputs['Geometry'])
 
-    distribute_points.inputs['Density'].default_value = props.density
-    set_point_radius.inputs['Radius'].default_value = props.radius
-    distribute_points.inputs['Seed'].default_value = props.random
-
-    props.applied_effect = "ADD_POINTS"
-    context.area.tag_redraw()
-
 def apply_mesh_to_points(context):
     selected_object = context.active_object
-    props = selected_object.easy_points_props
-
-    existing_modifier = None
-    for mod in selected_object.modifiers:
-        if mod.type == 'NODES':
-            existing_modifier = mod
-            break
-
-    if existing_modifier is None:
-        bpy.ops.object.modifier_add(type='NODES')
-        modifier = selected_object.modifiers[-1]
-    else:
-        modifier = existing_modifier
-
-    if modifier.node_group is None:
-        bpy.ops.node.new_geometry_node_group_assign()
-        node_group = modifier.node_group
-    else:
-        node_group = modifier.node_group
-
-    if node_group is None:
-        return
+    assign_point_template(selected_object, selected_object.easy_points_props, 'MESH_TO_POINTS')
+    context.area.tag_redraw()
 
+def build_mesh_to_points_nodes(node_group):
     nodes = node_group.nodes
     links = node_group.links
 
-    group_input = nodes.get('Group Input') or nodes.new('NodeGroupInput')
-    group_output = nodes.get('Group Output') or nodes.new('NodeGroupOutput')
+    new_group_socket(node_group, "Radius", 'NodeSocketFloat')
+    new_group_socket(node_group, "Instancing", 'NodeSocketBool')
+    new_group_socket(node_group, "Instance Object", 'NodeSocketObject')
+    new_group_socket(node_group, "Scale", 'NodeSocketFloat')
+    new_group_socket(node_group, "Material", 'NodeSocketMaterial')
+
+    group_input = nodes['Group Input']
+    group_output = nodes['Group Output']
 
     mesh_to_points = nodes.new(type="GeometryNodeMeshToPoints")
     object_info = nodes.new(type="GeometryNodeObjectInfo")
     instance_on_points = nodes.new(type="GeometryNodeInstanceOnPoints")
+    switch = nodes.new(type="GeometryNodeSwitch")
+    switch.input_type = 'GEOMETRY'
     set_material = nodes.new(type="GeometryNodeSetMaterial")
 
-    if selected_object.active_material:
-        set_material.inputs['Material'].default_value = selected_object.active_material
-    else:
-        set_material.inputs['Material'].default_value = create_default_material()
+    mesh_to_points.location = (0, 0)
+    object_info.location = (300, -250)
+    instance_on_points.location = (500, 0)
+    switch.location = (800, 0)
+    set_material.location = (1100, 0)
 
     links.new(group_input.outputs['Geometry'], mesh_to_points.inputs['Mesh'])
+    links.new(group_input.outputs['Radius'], mesh_to_points.inputs['Radius'])
+    links.new(group_input.outputs['Instance Object'], object_info.inputs['Object'])
     links.new(mesh_to_points.outputs['Points'], instance_on_points.inputs['Points'])
     links.new(object_info.outputs['Geometry'], instance_on_points.inputs['Instance'])
-    links.new(instance_on_points.outputs['Instances'], set_material.inputs['Geometry'])
-    links.new(set_material.outputs['Geometry'], group_output.inputs['Geometry'])
-
-    mesh_to_points.inputs['Radius'].default_value = props.radius
-
-    instance_obj = bpy.data.objects.get(props.instance_object)
-    if instance_obj:
-        object_info.inputs['Object'].default_value = instance_obj
+    links.new(group_input.outputs['Scale'], instance_on_points.inputs['Scale'])
 
-    instance_on_points.mute = not props.enable_points
+    # A Switch instead of muting Instance on Points, so one template serves every object
+    switch_input, false_input, true_input = enabled_sockets(switch.inputs)
+    links.new(group_input.outputs['Instancing'], switch_input)
+    links.new(mesh_to_points.outputs['Points'], false_input)
+    links.new(instance_on_points.outputs['Instances'], true_input)
 
-    props.applied_effect = "MESH_TO_POINTS"
-    context.area.tag_redraw()
+    links.new(enabled_sockets(switch.outputs)[0], set_material.inputs['Geometry'])
+    links.new(group_input.outputs['Material'], set_material.inputs['Material'])
+    links.new(set_material.outputs['Geometry'], group_output.inputs['Geometry'])
 
 class OBJECT_OT_add_points_modifier(bpy.types.Operator):
     bl_idname = "object.add_points_modifier"
@@ -266,15 +309,9 @@ class OBJECT_OT_reset_model(bpy.types.Operator):
     def execute(self, context):
         selected_object = context.active_object
         if selected_object and selected_object.type == 'MESH':
-            for mod in selected_object.modifiers:
-                if mod.type == 'NODES' and mod.node_group:
-                    for node in mod.node_group.nodes:
-                        if node.bl_idname == "GeometryNodeSetPointRadius":
-                            node.inputs['Radius'].default_value = 0.023
-                        if node.bl_idname == "GeometryNodeDistributePointsOnFaces":
-                            node.inputs['Density'].default_value = 25.0
-                        if node.bl_idname == "GeometryNodeMeshToPoints":
-                            node.inputs['Radius'].default_value = 0.023
+            # Assigning the properties pushes the values to the modifier inputs
+            selected_object.easy_points_props.radius = 0.023
+            selected_object.easy_points_props.density = 25.0
             selected_object.easy_points_props.applied_effect = ""
             self.report({'INFO'}, "Geometry modifier reset to default point size and density settings")
         else:
@@ -6,7 +6,340 @@ bl_info = {
 
 import bpy
 import bmesh
-from bpy_extras.io_utils import ExportHelper
+from bpy_extras.io_utils import ExportHelper, ImportHelper
+
+import itertools
+import numpy as np
+
+# NumPy helpers: geometry moves through flat float32 buffers with foreach_get/foreach_set
+# instead of a Python object per vertex
+def read_vertex_positions(mesh):
+    co = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", co)
+    return co
+
+def new_point_mesh(name, co):
+    point_cloud_mesh = bpy.data.meshes.new(name=name)
+    point_cloud_mesh.vertices.add(len(co) // 3)
+    point_cloud_mesh.vertices.foreach_set("co", co)
+    point_cloud_mesh.update()
+    return point_cloud_mesh
+
+def new_point_cloud(name, co, radius):
+    # Returns None when this Blender build cannot size a PointCloud from Python.
+    if not hasattr(bpy.data, "pointclouds"):
+        return None
+    point_cloud = bpy.data.pointclouds.new(name=name)
+    if not hasattr(point_cloud, "resize"):
+        bpy.data.pointclouds.remove(point_cloud)
+        return None
+
+    count = len(co) // 3
+    point_cloud.resize(count)
+    point_cloud.attributes["position"].data.foreach_set("vector", co)
+
+    if np.ndim(radius) == 0:
+        radius = np.full(count, radius, dtype=np.float32)
+    write_point_attribute(point_cloud, "radius", radius)
+    point_cloud.update_tag()
+    return point_cloud
+
+def point_data_type(values):
+    # The attribute type a column is written as when its source type is not known
+    width = 1 if values.ndim == 1 else values.shape[1]
+    if values.dtype.kind == "b":
+        return 'BOOLEAN' if width == 1 else None
+    if values.dtype.kind in "iu":
+        return {1: 'INT8' if values.dtype == np.int8 else 'INT', 2: 'INT32_2D'}.get(width)
+    return {1: 'FLOAT', 2: 'FLOAT2', 3: 'FLOAT_VECTOR', 4: 'FLOAT_COLOR'}.get(width)
+
+def write_point_attribute(data, name, values, data_type=None):
+    # Columns whose type cannot be told from the values or whose width does not
+    # match the type are skipped
+    if data_type is None:
+        data_type = point_data_type(values)
+    if data_type in ATTRIBUTE_WIDTHS:
+        (width, key), dtype = ATTRIBUTE_WIDTHS[data_type], np.float32
+    elif data_type in OTHER_ATTRIBUTE_TYPES:
+        width, key, dtype = OTHER_ATTRIBUTE_TYPES[data_type]
+    else:
+        return None
+    if (1 if values.ndim == 1 else values.shape[1]) != width:
+        return None
+    attribute = data.attributes.get(name)
+    if attribute is not None and attribute.data_type != data_type:
+        data.attributes.remove(attribute)
+        attribute = None
+    if attribute is None:
+        attribute = data.attributes.new(name, data_type, 'POINT')
+    attribute.data.foreach_set(key, np.ascontiguousarray(values, dtype=dtype).ravel())
+    return attribute
+
+def mesh_to_point_object(context, source_object, name="PointCloud", output_type='MESH', radius=0.023):
+    co = read_vertex_positions(source_object.data)
+    point_data = None
+    if output_type == 'POINTCLOUD':
+        point_data = new_point_cloud(name, co, radius)
+    if point_data is None:
+        point_data = new_point_mesh(name, co)
+    point_cloud_obj = bpy.data.objects.new(name=name, object_data=point_data)
+    context.collection.objects.link(point_cloud_obj)
+    return point_cloud_obj
+
+ATTRIBUTE_WIDTHS = {'FLOAT': (1, "value"), 'FLOAT2': (2, "vector"), 'FLOAT_VECTOR': (3, "vector"), 'FLOAT_COLOR': (4, "color")}
+
+# (width, key, NumPy type) of the other attribute types that are read as point columns.
+# Byte colors are read as float colors; strings and matrices are not read.
+OTHER_ATTRIBUTE_TYPES = {
+    'INT': (1, "value", np.int32), 'INT8': (1, "value", np.int8), 'BOOLEAN': (1, "value", bool),
+    'INT32_2D': (2, "value", np.int32), 'BYTE_COLOR': (4, "color", np.float32), 'QUATERNION': (4, "value", np.float32),
+}
+
+def read_point_attributes(data):
+    count = len(data.points) if hasattr(data, "points") else len(data.vertices)
+    columns = {}
+    for attribute in data.attributes:
+        if attribute.domain != 'POINT' or attribute.name.startswith("."):
+            continue
+        if attribute.data_type in ATTRIBUTE_WIDTHS:
+            width, key = ATTRIBUTE_WIDTHS[attribute.data_type]
+            dtype = np.float32
+        elif attribute.data_type in OTHER_ATTRIBUTE_TYPES:
+            width, key, dtype = OTHER_ATTRIBUTE_TYPES[attribute.data_type]
+        else:
+            continue
+        values = np.empty(count * width, dtype=dtype)
+        attribute.data.foreach_get(key, values)
+        columns[attribute.name] = values.reshape(count, width) if width > 1 else values
+    if "position" not in columns and hasattr(data, "vertices"):
+        columns["position"] = read_vertex_positions(data).reshape(-1, 3)
+    return columns
+
+def read_evaluated_points(depsgraph, obj):
+    # Collects the points the object actually evaluates to, including the point
+    # clouds produced by geometry nodes, in world space. Instanced geometry is skipped.
+    point_sets = []
+    for instance in depsgraph.object_instances:
+        owner = instance.parent if instance.is_instance else instance.object
+        if owner is None or owner.original != obj:
+            continue
+        instance_object = instance.object
+        if instance_object.type == 'POINTCLOUD' or (instance_object.type == 'MESH' and not instance.is_instance):
+            columns = read_point_attributes(instance_object.data)
+            if len(columns["position"]) == 0:
+                continue
+            matrix = np.array(instance.matrix_world, dtype=np.float32)
+            columns["position"] = columns["position"] @ matrix[:3, :3].T + matrix[:3, 3]
+            point_sets.append(columns)
+
+    if not point_sets:
+        return {}
+    names = [name for name in point_sets[0] if all(name in columns for columns in point_sets)]
+    return {name: np.concatenate([columns[name] for columns in point_sets]) for name in names}
+
+PLY_CHUNK_SIZE = 1 << 20
+
+NORMAL_NAMES = ("normal", "N")
+
+COLOR_NAMES = ("color", "Color", "Col", "Cd")
+
+def ply_property_name(name):
+    return "".join(character if character.isalnum() else "_" for character in name)
+
+def ply_fields(columns):
+    # (column, component or None, PLY property, NumPy type), position, normals and
+    # colors first so they keep their standard names. Other attribute names are
+    # sanitized and given a numeric suffix when they collide with a name in use.
+    fields, other_fields = [], []
+    for name in ["position"] + [name for name in columns if name != "position"]:
+        values = columns[name]
+        width = 1 if values.ndim == 1 else values.shape[1]
+        if name == "position":
+            fields += [(name, index, axis, "<f4") for index, axis in enumerate(("x", "y", "z"))]
+        elif name in NORMAL_NAMES and width == 3 and "nx" not in [field[2] for field in fields]:
+            fields += [(name, index, axis, "<f4") for index, axis in enumerate(("nx", "ny", "nz"))]
+        elif name in COLOR_NAMES and width in (3, 4) and "red" not in [field[2] for field in fields]:
+            channels = ("red", "green", "blue", "alpha")[:width]
+            fields += [(name, index, channel, "u1") for index, channel in enumerate(channels)]
+        elif width == 1:
+            other_fields.append((name, None, ply_property_name(name), "<f4"))
+        else:
+            other_fields += [(name, index, f"{ply_property_name(name)}_{index}", "<f4") for index in range(width)]
+
+    used = {field[2] for field in fields}
+    for column, component, property_name, ply_type in other_fields:
+        unique_name, suffix = property_name, 1
+        while unique_name in used:
+            unique_name, suffix = f"{property_name}_{suffix}", suffix + 1
+        used.add(unique_name)
+        fields.append((column, component, unique_name, ply_type))
+    return fields
+
+def write_ply(filepath, columns, chunk_size=PLY_CHUNK_SIZE):
+    # Binary little-endian PLY. Rows are packed into a reused structured array
+    # one chunk at a time and written straight to disk.
+    count = len(columns["position"])
+    fields = ply_fields(columns)
+    dtype = np.dtype([(name, ply_type) for _, _, name, ply_type in fields])
+
+    header = ["ply", "format binary_little_endian 1.0", f"element vertex {count}"]
+    header += [f"property {'uchar' if ply_type == 'u1' else 'float'} {name}" for _, _, name, ply_type in fields]
+    header.append("end_header")
+
+    with open(filepath, "wb") as f:
+        f.write(("\n".join(header) + "\n").encode("ascii"))
+        chunk = np.empty(min(chunk_size, count), dtype=dtype)
+        for start in range(0, count, chunk_size):
+            stop = min(start + chunk_size, count)
+            rows = chunk[:stop - start]
+            for column, component, name, ply_type in fields:
+                values = columns[column][start:stop]
+                if component is not None:
+                    values = values[:, component]
+                if ply_type == "u1":
+                    values = np.clip(values * 255.0 + 0.5, 0.0, 255.0)
+                rows[name] = values
+            rows.tofile(f)
+
+PLY_TYPES = {
+    "char": "i1", "int8": "i1", "uchar": "u1", "uint8": "u1",
+    "short": "i2", "int16": "i2", "ushort": "u2", "uint16": "u2",
+    "int": "i4", "int32": "i4", "uint": "u4", "uint32": "u4",
+    "float": "f4", "float32": "f4", "double": "f8", "float64": "f8",
+}
+
+PCD_TYPES = {
+    ("F", 4): "f4", ("F", 8): "f8",
+    ("I", 1): "i1", ("I", 2): "i2", ("I", 4): "i4",
+    ("U", 1): "u1", ("U", 2): "u2", ("U", 4): "u4",
+}
+
+TEXT_CHUNK_SIZE = 1 << 18
+
+def point_columns(records, names):
+    # Copies only the decimated rows out of a (possibly memory-mapped) record view.
+    columns = {"position": np.column_stack([records[name] for name in ("x", "y", "z")]).astype(np.float32)}
+    if "radius" in names:
+        columns["radius"] = np.asarray(records["radius"], dtype=np.float32)
+    if all(name in names for name in ("red", "green", "blue")):
+        color = np.column_stack([records[name] for name in ("red", "green", "blue")]).astype(np.float32)
+        if records["red"].dtype.kind in "iu":
+            color /= 255.0
+        columns["color"] = np.column_stack([color, np.ones(len(color), dtype=np.float32)])
+    return columns
+
+def load_ply(filepath, step=1):
+    with open(filepath, "rb") as f:
+        if f.readline().strip() != b"ply":
+            raise ValueError("Not a PLY file")
+        data_format = None
+        count = None
+        fields = []
+        elements = []
+        for line in iter(f.readline, b""):
+            words = line.decode("ascii").split()
+            if not words or words[0] in ("comment", "obj_info"):
+                continue
+            if words[0] == "format":
+                data_format = words[1]
+            elif words[0] == "element":
+                elements.append(words[1])
+                if words[1] == "vertex":
+                    count = int(words[2])
+            elif words[0] == "property" and not elements:
+                raise ValueError("PLY property declared before any element")
+            elif words[0] == "property" and elements[-1] == "vertex":
+                if words[1] == "list":
+                    raise ValueError("PLY vertex list properties are not supported")
+                fields.append((words[2], PLY_TYPES[words[1]]))
+            elif words[0] == "end_header":
+                break
+        offset = f.tell()
+
+    # Elements after the vertex block (faces, edges) are never read
+    if not elements or elements[0] != "vertex":
+        raise ValueError("PLY file must start with a vertex element")
+    names = [name for name, _ in fields]
+    if data_format == "ascii":
+        integer_color = dict(fields).get("red", "u1")[0] in "iu"
+        return load_text_points(filepath, step, names=names, header_bytes=offset, integer_color=integer_color, max_rows=count)
+    byte_order = {"binary_little_endian": "<", "binary_big_endian": ">"}[data_format]
+    dtype = np.dtype([(name, byte_order + code) for name, code in fields])
+    records = np.memmap(filepath, dtype=dtype, mode="r", offset=offset, shape=(count,))
+    return point_columns(records[::step], names)
+
+def load_pcd(filepath, step=1):
+    header = {}
+    with open(filepath, "rb") as f:
+        for line in iter(f.readline, b""):
+            words = line.decode("ascii").split()
+            if not words or words[0].startswith("#"):
+                continue
+            header[words[0].upper()] = words[1:]
+            if words[0].upper() == "DATA":
+                break
+        offset = f.tell()
+
+    names = header["FIELDS"]
+    sizes = [int(size) for size in header["SIZE"]]
+    counts = [int(count) for count in header.get("COUNT", ["1"] * len(names))]
+    count = int(header["POINTS"][0])
+    data_format = header["DATA"][0]
+    if data_format == "ascii":
+        return load_text_points(filepath, step, names=names, header_bytes=offset, integer_color=False, max_rows=count)
+    if data_format != "binary":
+        raise ValueError(f"PCD data format '{data_format}' is not supported")
+
+    fields = []
+    for name, kind, size, field_count in zip(names, header["TYPE"], sizes, counts):
+        code = "<" + PCD_TYPES[(kind, size)]
+        fields.append((name, code, (field_count,)) if field_count > 1 else (name, code))
+    records = np.memmap(filepath, dtype=np.dtype(fields), mode="r", offset=offset, shape=(count,))[::step]
+
+    columns = point_columns(records, names)
+    if "rgb" in names or "rgba" in names:
+        # PCL packs 8-bit colors into one 32-bit field
+        packed = np.ascontiguousarray(records["rgb" if "rgb" in names else "rgba"]).view("<u4")
+        channels = [(packed >> shift) & 0xFF for shift in (16, 8, 0)]
+        color = np.column_stack(channels).astype(np.float32) / 255.0
+        columns["color"] = np.column_stack([color, np.ones(len(color), dtype=np.float32)])
+    return columns
+
+def load_text_points(filepath, step=1, names=None, header_bytes=0, integer_color=True, max_rows=None, chunk_size=TEXT_CHUNK_SIZE):
+    # XYZ style text, x y z first and optionally r g b, parsed chunk by chunk.
+    blocks = []
+    row_offset = 0
+    with open(filepath, "rb") as f:
+        f.seek(header_bytes)
+        while max_rows is None or row_offset < max_rows:
+            limit = chunk_size if max_rows is None else min(chunk_size, max_rows - row_offset)
+            lines = list(itertools.islice(f, limit))
+            if not lines:
+                break
+            # A chunk can be nothing but comments or blank lines, which loadtxt turns into a (0, 1) block
+            lines = [line for line in lines if line.strip() and not line.lstrip().startswith(b"#")]
+            if not lines:
+                continue
+            block = np.loadtxt(lines, dtype=np.float32, ndmin=2, comments="#")
+            blocks.append(block[(-row_offset) % step::step])
+            row_offset += len(block)
+
+    values = np.concatenate(blocks) if blocks else np.empty((0, 3), dtype=np.float32)
+    if names is None:
+        names = ["x", "y", "z", "red", "green", "blue"][:values.shape[1]]
+    records = {name: values[:, index] for index, name in enumerate(names) if index < values.shape[1]}
+    columns = point_columns(records, names)
+    if "color" in columns and integer_color:
+        columns["color"][:, :3] /= 255.0
+    return columns
+
+def load_point_file(filepath, step=1):
+    extension = filepath.rsplit(".", 1)[-1].lower()
+    if extension == "ply":
+        return load_ply(filepath, step)
+    if extension == "pcd":
+        return load_pcd(filepath, step)
+    return load_text_points(filepath, step)
 
 class ConvertToPointCloudOperator(bpy.types.Operator):
     bl_idname = "object.convert_to_point_cloud"
@@ -18,37 +351,73 @@ class ConvertToPointCloudOperator(bpy.types.Operator):
             self.report({'ERROR'}, "No mesh object selected")
             return {'CANCELLED'}
         
-        mesh = obj.data
-        bm = bmesh.new()
-        bm.from_mesh(mesh)
-        bm.verts.ensure_lookup_table()
-        
-        points = [v.co.copy() for v in bm.verts]
-        bm.clear()
-        
-        point_cloud_mesh = bpy.data.meshes.new(name="PointCloud")
-        point_cloud_obj = bpy.data.objects.new(name="PointCloud", object_data=point_cloud_mesh)
-        context.collection.objects.link(point_cloud_obj)
-        
-        point_cloud_mesh.from_pydata(points, [], [])
-        point_cloud_mesh.update()
+        scene = context.scene
+        point_cloud_obj = mesh_to_point_object(
+            context, obj, output_type=scene.point_output_type, radius=scene.point_radius
+        )
+        if scene.point_output_type == 'POINTCLOUD' and point_cloud_obj.type != 'POINTCLOUD':
+            self.report({'WARNING'}, "Point Cloud output is not available in this Blender version, created a mesh instead")
         
         bpy.data.objects.remove(obj)
         
         return {'FINISHED'}
 
 class ExportPointCloudOperator(bpy.types.Operator, ExportHelper):
-    bl_idname = "export_mesh.ply"
+    bl_idname = "export_scene.point_cloud_ply"
     bl_label = "Export Point Cloud"
     filename_ext = ".ply"
     
     def execute(self, context):
         obj = context.active_object
-        if obj is None or obj.type != 'MESH':
+        if obj is None or obj.type not in {'MESH', 'POINTCLOUD'}:
             self.report({'ERROR'}, "No point cloud object selected")
             return {'CANCELLED'}
         
-        bpy.ops.export_mesh.ply(filepath=self.filepath, use_selection=True, use_mesh_modifiers=False)
+        columns = read_evaluated_points(context.evaluated_depsgraph_get(), obj)
+        if not columns:
+            self.report({'ERROR'}, "Object has no points to export")
+            return {'CANCELLED'}
+        
+        write_ply(self.filepath, columns)
+        self.report({'INFO'}, f"Exported {len(columns['position'])} points")
+        return {'FINISHED'}
+
+class ImportPointCloudOperator(bpy.types.Operator, ImportHelper):
+    bl_idname = "import_scene.point_cloud"
+    bl_label = "Import Point Cloud"
+    bl_options = {'REGISTER', 'UNDO'}
+    
+    filter_glob: bpy.props.StringProperty(default="*.ply;*.pcd;*.xyz;*.txt", options={'HIDDEN'})
+    decimate: bpy.props.IntProperty(
+        name="Keep Every Nth Point",
+        description="Only read every Nth point, 1 reads the whole file",
+        default=1,
+        min=1
+    )
+    
+    def execute(self, context):
+        try:
+            columns = load_point_file(self.filepath, self.decimate)
+        except (OSError, ValueError, KeyError) as error:
+            self.report({'ERROR'}, f"Could not read point cloud: {error}")
+            return {'CANCELLED'}
+        
+        scene = context.scene
+        name = bpy.path.display_name_from_filepath(self.filepath)
+        co = columns["position"].ravel()
+        point_data = None
+        if scene.point_output_type == 'POINTCLOUD':
+            point_data = new_point_cloud(name, co, columns.get("radius", scene.point_radius))
+        if point_data is None:
+            point_data = new_point_mesh(name, co)
+            if "radius" in columns:
+                write_point_attribute(point_data, "radius", columns["radius"])
+        if "color" in columns:
+            write_point_attribute(point_data, "Col", columns["color"])
+        
+        point_cloud_obj = bpy.data.objects.new(name=name, object_data=point_data)
+        context.collection.objects.link(point_cloud_obj)
+        self.report({'INFO'}, f"Imported {len(columns['position'])} points")
         return {'FINISHED'}
 
 class AdjustPointSizeOperator(bpy.types.Operator):
@@ -84,8 +453,12 @@ class SimpleMeshToPointCloudPanel(bpy.types.Panel):
     
     def draw(self, context):
         layout = self.layout
+        layout.prop(context.scene, "point_output_type", text="Output")
+        if context.scene.point_output_type == 'POINTCLOUD':
+            layout.prop(context.scene, "point_radius", text="Point Radius")
         layout.operator("object.convert_to_point_cloud", text="Convert to Point Cloud")
-        layout.operator("export_mesh.ply", text="Export Point Cloud")
+        layout.operator("import_scene.point_cloud", text="Import Point Cloud")
+        layout.operator("export_scene.point_cloud_ply", text="Export Point Cloud")
         
         layout.prop(context.scene, "point_size", text="Point Size")
         layout.operator("object.adjust_point_size", text="Adjust Point Size")
@@ -93,6 +466,7 @@ class SimpleMeshToPointCloudPanel(bpy.types.Panel):
 def register():
     bpy.utils.register_class(ConvertToPointCloudOperator)
     bpy.utils.register_class(ExportPointCloudOperator)
+    bpy.utils.register_class(ImportPointCloudOperator)
     bpy.utils.register_class(AdjustPointSizeOperator)
     bpy.utils.register_class(SimpleMeshToPointCloudPanel)
     
@@ -103,14 +477,33 @@ def register():
         min=0.01,
         max=10.0
     )
+    bpy.types.Scene.point_output_type = bpy.props.EnumProperty(
+        name="Output Type",
+        description="Datablock type created by the converter",
+        items=[
+            ('MESH', "Mesh", "Vertex-only mesh, needs Mesh to Points to render as points"),
+            ('POINTCLOUD', "Point Cloud", "Native point cloud that Cycles renders as point primitives"),
+        ],
+        default='MESH'
+    )
+    bpy.types.Scene.point_radius = bpy.props.FloatProperty(
+        name="Point Radius",
+        description="Radius written to every point of a Point Cloud output",
+        default=0.023,
+        min=0.0,
+        max=100.0
+    )
 
 def unregister():
     bpy.utils.unregister_class(ConvertToPointCloudOperator)
     bpy.utils.unregister_class(ExportPointCloudOperator)
+    bpy.utils.unregister_class(ImportPointCloudOperator)
     bpy.utils.unregister_class(AdjustPointSizeOperator)
     bpy.utils.unregister_class(SimpleMeshToPointCloudPanel)
     
     del bpy.types.Scene.point_size
+    del bpy.types.Scene.point_output_type
+    del bpy.types.Scene.point_radius
 
 if __name__ == "__main__":
     register()